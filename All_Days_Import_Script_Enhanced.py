@@ -16,6 +16,8 @@ import sys
 import traceback
 import re
 
+from powerapp_datetime_cache import DatetimeParseCache
+
 # Configure logging with debug mode
 logging.basicConfig(
     level=logging.DEBUG,  # Enhanced logging
@@ -308,6 +310,9 @@ def parse_powerapp_datetime(date_str, field_name="unknown"):
         logger.error(traceback.format_exc())
         return None
 
+# Exports repeat the same timestamps - parse each distinct value once
+parse_powerapp_datetime_cached = DatetimeParseCache(parse_powerapp_datetime)
+
 def find_customer_by_contact(cursor, contact_name, contact_phone):
     """Find existing customer by contact information."""
     try:
@@ -462,11 +467,11 @@ def import_all_days_events():
                     # ENHANCED: Parse dates with detailed logging
                     logger.info(f"📅 Parsing datetime fields for event: '{event_name}'")
                     
-                    event_start_datetime = parse_powerapp_datetime(
+                    event_start_datetime = parse_powerapp_datetime_cached(
                         row.get('ma_nikahstartdatetime'), 
                         'ma_nikahstartdatetime'
                     )
-                    event_end_datetime = parse_powerapp_datetime(
+                    event_end_datetime = parse_powerapp_datetime_cached(
                         row.get('ma_nikahendatetime'), 
                         'ma_nikahendatetime'
                     )
@@ -637,6 +642,7 @@ def import_all_days_events():
         logger.info(f"❌ Failed imports: {error_count} events")
         logger.info(f"📅 DateTime parsing successful: {datetime_success_count}")
         logger.info(f"⚠️  DateTime parsing failed: {datetime_fail_count}")
+        logger.info(f"🗂️  DateTime parse cache: {parse_powerapp_datetime_cached.summary()}")
         logger.info("=" * 80)
         
         if errors:
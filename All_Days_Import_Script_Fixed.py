@@ -15,6 +15,8 @@ from decimal import Decimal
 import sys
 import traceback
 
+from powerapp_datetime_cache import DatetimeParseCache
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -255,6 +257,9 @@ def parse_powerapp_datetime(date_str):
         logger.warning(f"Error parsing datetime '{date_str}': {e}")
         return None
 
+# Exports repeat the same timestamps - parse each distinct value once
+parse_powerapp_datetime_cached = DatetimeParseCache(parse_powerapp_datetime)
+
 def find_customer_by_contact(cursor, contact_name, contact_phone):
     """Find existing customer by contact information."""
     try:
@@ -413,8 +418,8 @@ def import_all_days_events():
                     customer_id = find_customer_by_contact(cursor, primary_contact, primary_phone)
                     
                     # FIXED: Parse dates with AM/PM support
-                    event_start_datetime = parse_powerapp_datetime(row.get('ma_nikahstartdatetime'))
-                    event_end_datetime = parse_powerapp_datetime(row.get('ma_nikahendatetime'))
+                    event_start_datetime = parse_powerapp_datetime_cached(row.get('ma_nikahstartdatetime'))
+                    event_end_datetime = parse_powerapp_datetime_cached(row.get('ma_nikahendatetime'))
                     
                     if event_start_datetime:
                         event_start_date = event_start_datetime.date()
@@ -570,6 +575,7 @@ def import_all_days_events():
         
         # Final summary
         logger.info(f"Import completed: {success_count} successful, {error_count} errors")
+        logger.info(f"Datetime parse cache: {parse_powerapp_datetime_cached.summary()}")
         if errors:
             logger.info("Errors encountered:")
             for error in errors:
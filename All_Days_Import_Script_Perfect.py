@@ -5,27 +5,62 @@ Fixes all critical issues: JSON ethnicity, proper field mappings, correct table
 """
 
 import pandas as pd
+import numpy as np
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extensions import TRANSACTION_STATUS_INERROR
+from psycopg2.extras import RealDictCursor, execute_values
 import json
+import os
 import uuid
 from datetime import datetime, date, time
 import logging
+from logging.handlers import QueueHandler, QueueListener
+import queue
+import atexit
+import multiprocessing
+import threading
 from decimal import Decimal
 import sys
 import traceback
 import re
+import argparse
+from contextlib import contextmanager, nullcontext
+from bisect import bisect_right
+from collections import Counter, deque
+import glob
+from time import perf_counter
 
-# Configure logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('all_days_import_corrected.log', encoding='utf-8'),
+from powerapp_datetime_cache import DatetimeParseCache
+
+logger = logging.getLogger(__name__)
+
+LOG_FILE = 'all_days_import_corrected.log'
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+def configure_logging(level=logging.DEBUG):
+    """Configure logging so file and console I/O happen off the import thread.
+
+    Records go through a QueueHandler; a QueueListener thread writes them to the
+    log file and stdout. Hot-path messages use lazy %-style arguments behind
+    isEnabledFor, so at higher levels they cost almost nothing.
+    """
+    formatter = logging.Formatter(LOG_FORMAT)
+    handlers = [
+        logging.FileHandler(LOG_FILE, encoding='utf-8'),
         logging.StreamHandler(sys.stdout)
     ]
-)
-logger = logging.getLogger(__name__)
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.handlers[:] = [QueueHandler(log_queue)]
+    root.setLevel(level)
+    
+    listener = QueueListener(log_queue, *handlers)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
 
 # Database configuration
 DB_CONFIG = {
@@ -41,10 +76,93 @@ DB_CONFIG = {
 TENANT_ID = 'e2a03656-036e-4041-a24e-c06e85747906'
 ALL_DAY_EVENT_TYPE = 'All Day'
 
+CSV_FILE = 'ma_alldaies.csv'
+
 # Form IDs for Nikkah and Reception forms (will be loaded from DB)
 NIKKAH_FORM_ID = 'b4c302ae-9a3b-45e9-9c0e-95e857a8592f'
 RECEPTION_FORM_ID = '1600029b-735b-4e93-b4a9-baaf20872d70'
 
+# PowerApps to internal field mappings with correct field names
+POWERAPP_NIKKAH_MAPPINGS = {
+    'ma_nikahextrahoursyesno': ('extra_hour', 'ma_nikahextrahoursprice'),
+    'ma_nikahtopuplambyesno': ('extra_1', 'ma_nikahtopuplambprice'),  # Map to available fields
+    'ma_nikahwelcomedrinksyesno': ('extra_2', 'ma_nikahwelcomedrinksprice'),
+    'ma_nikahdesserttableyesno': ('dessert_table', 'ma_nikahdesserttableprice'),
+    'ma_nikahfruittableyesno': ('fruit_table', 'ma_nikahfruittableprice'),
+    'ma_nikahfullcutleryyesno': ('full_cutlery', 'ma_nikahfullcutleryprice'),
+    'ma_nikahfogandsparkleyesno': ('fog_and_sparkles', 'ma_nikahfogandsparkleprice'),
+    'ma_nikahfruityesno': ('fruit_baskets', 'ma_nikahfruitprice'),
+    'ma_nikahextra1yesno': ('extra_3', 'ma_nikahextra1price'),
+    'ma_nikahextra2yesno': ('extra_4', 'ma_nikahextra2price'),
+    'ma_nikahextra3yesno': ('extra_5', 'ma_nikahextra3price'),
+    'ma_nikahextra4yesno': ('extra_6', 'ma_nikahextra4price'),
+    'ma_nikahnotessection': ('notes_section', None)
+}
+
+POWERAPP_RECEPTION_MAPPINGS = {
+    'ma_themecolour': ('notes_section', None),  # Map theme to notes
+    'ma_stage': ('notes_section', None),
+    'ma_weddingfavours': ('notes_section', None),
+    'ma_centrepieces': ('centrepieces', None),
+    'ma_setup': ('setup', None),
+    'ma_dinnertime': ('dinner_time', None),
+    'ma_starter': ('notes_section', None),
+    'ma_maincourse': ('main_course', None),
+    'ma_dessert': ('dessert', None),
+    'ma_specialrequest1': ('special_request_1', None),
+    'ma_specialrequest2': ('special_request_2', None),
+    'ma_diningchairs': ('dining_chairs', None),
+    'ma_fullcutlery': ('full_cutlery', None),
+    'ma_cakefromnarmin': ('cake', 'ma_cakefromnarmin'),
+    'ma_carpetrunner': ('carpet_runner', 'ma_carpetrunner'),
+    'ma_desserttable': ('dessert_table', 'ma_desserttable'),
+    'ma_fruittable': ('fruit_table', 'ma_fruittable'),
+    'ma_receptionfogandsparkle': ('fog_and_sparkles', 'ma_receptionfogandsparkle'),
+    'ma_invitationbycard': ('invitation_by_card', 'ma_invitationbycard'),
+    'ma_password': ('password', 'ma_password'),
+    'ma_receptionextra1yesno': ('extra_1', 'ma_receptionextra1price'),
+    'ma_receptionextra2yesno': ('extra_2', 'ma_receptionextra2price'),
+    'ma_receptionextra3yesno': ('extra_3', 'ma_receptionextra3price'),
+    'ma_receptionextra4yesno': ('extra_4', 'ma_receptionextra4price'),
+    'ma_notessection': ('notes_section', None)
+}
+
+# CSV columns coerced once per column by prepare_import_records
+CORE_TEXT_COLUMNS = ['ma_title', 'ma_primarycontactname', 'ma_primarycontactnumber', 'ma_ethnicity']
+CORE_COUNT_COLUMNS = ['ma_nikahmencount', 'ma_nikahladiescount', 'ma_receptionmencount', 'ma_receptionladiescount']
+CORE_PRICE_COLUMNS = ['ma_nikahtotalguestprice', 'ma_receptiontotalguestprice', 'ma_depositamount']
+DATETIME_COLUMNS = ['ma_nikahstartdatetime', 'ma_nikahendatetime']
+
+FORM_FLAG_COLUMNS = list(dict.fromkeys(
+    list(POWERAPP_NIKKAH_MAPPINGS) + list(POWERAPP_RECEPTION_MAPPINGS)
+))
+FORM_PRICE_COLUMNS = list(dict.fromkeys(
+    price_field
+    for _, price_field in list(POWERAPP_NIKKAH_MAPPINGS.values()) + list(POWERAPP_RECEPTION_MAPPINGS.values())
+    if price_field
+))
+# Toggle flags with their own yes/no column (some reception toggles read the
+# flag from the price column itself, which must stay text)
+FORM_YESNO_COLUMNS = list(dict.fromkeys(
+    powerapp_field
+    for powerapp_field, (_, price_field) in list(POWERAPP_NIKKAH_MAPPINGS.items()) + list(POWERAPP_RECEPTION_MAPPINGS.items())
+    if price_field and powerapp_field not in FORM_PRICE_COLUMNS
+))
+
+# Declared read_csv schema: only these columns are parsed. Everything is read as
+# text (numbers are coerced once, column-wise, by prepare_import_records) and
+# the low-cardinality yes/no flags are stored as categories.
+CSV_SCHEMA = {
+    **{column: str for column in CORE_TEXT_COLUMNS + DATETIME_COLUMNS + FORM_FLAG_COLUMNS},
+    **{column: str for column in CORE_COUNT_COLUMNS + CORE_PRICE_COLUMNS + FORM_PRICE_COLUMNS},
+    **{column: 'category' for column in FORM_YESNO_COLUMNS},
+}
+REQUIRED_CSV_COLUMNS = ['ma_title', 'ma_nikahstartdatetime']
+
+# Contact numbers matched against customers.phone / customers.mobile
+PHONE_COLUMNS = ['ma_primarycontactnumber']
+DEFAULT_COUNTRY_CODE = '44'
+
 def safe_string(value):
     """Safely convert value to string, handling floats and NaN."""
     if pd.isna(value) or value is None:
@@ -66,7 +184,7 @@ def safe_int(value, default=0):
                 return default
         return int(float(value))
     except (ValueError, TypeError):
-        logger.warning(f"Could not convert '{value}' to integer, using default {default}")
+        logger.warning("Could not convert '%s' to integer, using default %s", value, default)
         return default
 
 def safe_decimal(value, default=0.0):
@@ -80,7 +198,7 @@ def safe_decimal(value, default=0.0):
                 return Decimal(str(default))
         return Decimal(str(float(value)))
     except (ValueError, TypeError):
-        logger.warning(f"Could not convert '{value}' to decimal, using default {default}")
+        logger.warning("Could not convert '%s' to decimal, using default %s", value, default)
         return Decimal(str(default))
 
 def safe_bool(value, default=False):
@@ -94,6 +212,349 @@ def safe_bool(value, default=False):
         return value in ['true', 'yes', '1', 'on']
     return bool(value)
 
+# Vectorized column coercion - same results as the safe_* helpers above,
+# computed once per column instead of once per cell.
+BLANK_TOKENS = ['', 'nan', 'none']
+TRUTHY_TOKENS = ['true', 'yes', '1', 'on']
+
+def _stripped_strings(series):
+    """Stripped copy of the string cells in a column; NaN for every other cell."""
+    if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+        return pd.Series(np.nan, index=series.index, dtype=object)
+    try:
+        return series.str.strip()
+    except AttributeError:  # object column without any strings (e.g. True/False/NaN)
+        return pd.Series(np.nan, index=series.index, dtype=object)
+
+def text_column(df, column):
+    """Column-wise safe_string: NaN -> '', numbers -> str(), strings stripped."""
+    if column not in df:
+        return pd.Series("", index=df.index, dtype=object)
+    raw = df[column]
+    if pd.api.types.is_numeric_dtype(raw) or pd.api.types.is_bool_dtype(raw):
+        result = raw.astype(str).astype(object)
+    else:
+        result = _stripped_strings(raw).astype(object)
+        other = result.isna() & raw.notna()
+        if other.any():
+            result[other] = raw[other].map(str)
+    return result.where(raw.notna(), "")
+
+def _numeric_column(df, column, scalar_fallback, default):
+    """Parse a column to float64, returning (values, blank_mask).
+
+    Cells the vectorized parse cannot handle (and that are not blank) are
+    handed to the scalar safe_* helper so warnings and edge cases stay identical.
+    """
+    raw = df[column]
+    if pd.api.types.is_bool_dtype(raw) or pd.api.types.is_numeric_dtype(raw):
+        values = raw.astype('float64')
+        return values, values.isna()
+
+    stripped = _stripped_strings(raw)
+    blank = raw.isna() | stripped.str.lower().isin(BLANK_TOKENS)
+    # float() once per distinct string, as the safe_* helpers parse (pd.to_numeric
+    # rounds differently past 15 significant digits)
+    codes, uniques = pd.factorize(stripped)
+    parsed = np.full(len(uniques) + 1, np.nan)
+    for position, text in enumerate(uniques):
+        try:
+            parsed[position] = float(text)
+        except ValueError:
+            pass
+    values = pd.Series(parsed[codes], index=raw.index)
+
+    residue = values.isna() & ~blank
+    if residue.any():
+        values = values.copy()
+        values[residue] = [float(scalar_fallback(v, default)) for v in raw[residue]]
+    return values, blank
+
+def int_column(df, column, default=0, invalid=None):
+    """Column-wise safe_int returning a list of Python ints.
+
+    Values outside int64 are converted one by one, as safe_int would: huge
+    counts stay Python ints, and cells safe_int raises on (infinity) get the
+    default here and their error recorded in invalid as {position: message}
+    so only those rows fail.
+    """
+    if column not in df:
+        return [default] * len(df)
+    values, blank = _numeric_column(df, column, safe_int, default)
+    values = values.where(~blank, default).to_numpy(dtype='float64')
+    in_range = np.isfinite(values) & (np.abs(values) < 2.0 ** 63)
+    result = np.trunc(np.where(in_range, values, 0)).astype('int64').tolist()
+    for position in np.flatnonzero(~in_range).tolist():
+        try:
+            result[position] = int(values[position])
+        except (OverflowError, ValueError) as e:
+            result[position] = default
+            if invalid is not None:
+                invalid.setdefault(position, f"{column}: {e}")
+    return result
+
+# Largest price (in pence) summed as int64: form totals add a few dozen columns,
+# so this leaves plenty of headroom before int64 would overflow
+MAX_WHOLE_PENCE = 2 ** 53
+
+def price_column(df, column, default=0.0):
+    """Column-wise safe_decimal returning (Decimals, pence, whole_pence).
+
+    Decimals are built once per distinct value (prices repeat heavily) and
+    broadcast back to the rows. pence is an int64 array of the same values in
+    integer pence; whole_pence is False where a value has fractions of a penny
+    or is too large for int64 sums (its pence entry is then 0 and the Decimal
+    must be used instead).
+    """
+    if column not in df:
+        default_decimal = Decimal(str(default))
+        return ([default_decimal] * len(df), np.full(len(df), int(default_decimal * 100), dtype='int64'),
+                np.ones(len(df), dtype=bool))
+    values, blank = _numeric_column(df, column, safe_decimal, default)
+    values = values.where(~blank, float(default))
+    # NaN only comes from the scalar fallback ('-nan'); keep it as its own value
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    decimals = [Decimal(str(float(v))) for v in uniques]
+    
+    unique_pence = np.zeros(len(decimals), dtype='int64')
+    unique_whole = np.zeros(len(decimals), dtype=bool)
+    for position, value in enumerate(decimals):
+        if value.is_finite() and abs(value) * 100 < MAX_WHOLE_PENCE and (value * 100) % 1 == 0:
+            unique_pence[position] = int(value * 100)
+            unique_whole[position] = True
+    
+    return [decimals[code] for code in codes], unique_pence[codes], unique_whole[codes]
+
+def bool_column(df, column, default=False):
+    """Column-wise safe_bool returning a list of Python bools."""
+    if column not in df:
+        return [default] * len(df)
+    raw = df[column]
+    if pd.api.types.is_bool_dtype(raw):
+        return raw.fillna(default).astype(bool).tolist()
+    if pd.api.types.is_numeric_dtype(raw):
+        return raw.where(raw.notna(), float(default)).astype(bool).tolist()
+
+    lowered = _stripped_strings(raw).str.lower()
+    result = lowered.isin(TRUTHY_TOKENS).astype(object)
+    other = lowered.isna() & raw.notna()
+    if other.any():
+        result[other] = raw[other].map(bool)
+    result[raw.isna()] = default
+    return result.astype(bool).tolist()
+
+PHONE_FLOAT_SUFFIX_RE = re.compile(r'\.0+$')
+NON_DIGIT_RE = re.compile(r'\D')
+
+def normalize_phone_number(value):
+    """Normalize a phone number to an E.164-style key ('+447700900123').
+
+    Handles spacing/punctuation, '00' and '+' international prefixes, UK trunk
+    zeros (including '+44 (0)7700...'), and numbers that lost their leading zero
+    or gained a '.0' suffix by passing through a float. Returns None for values
+    too short to be a phone number. Kept in step with the SQL function
+    public.normalize_phone_e164 so both sides produce the same key.
+    """
+    text = safe_string(value)
+    if not text:
+        return None
+    text = PHONE_FLOAT_SUFFIX_RE.sub('', text)
+    digits = NON_DIGIT_RE.sub('', text)
+    
+    if text.startswith('+'):
+        pass
+    elif digits.startswith('00'):
+        digits = digits[2:]
+    elif digits.startswith('0'):
+        digits = DEFAULT_COUNTRY_CODE + digits[1:]
+    elif digits.startswith(DEFAULT_COUNTRY_CODE) and len(digits) == 12:
+        pass
+    elif len(digits) == 10:
+        digits = DEFAULT_COUNTRY_CODE + digits
+    
+    if digits.startswith(DEFAULT_COUNTRY_CODE + '0'):
+        digits = DEFAULT_COUNTRY_CODE + digits[len(DEFAULT_COUNTRY_CODE) + 1:]
+    if len(digits) < 7:
+        return None
+    return '+' + digits
+
+def phone_key_column(df, column):
+    """Column-wise normalize_phone_number, computed once per distinct number."""
+    if column not in df:
+        return [None] * len(df)
+    codes, uniques = pd.factorize(df[column])
+    keys = [normalize_phone_number(value) for value in uniques]
+    return [keys[code] if code >= 0 else None for code in codes]
+
+def form_total_columns(prices, flags, form_totals, rows):
+    """Column-wise Nikkah/Reception form totals as {form_type: [Decimal or None]}.
+
+    form_totals (see compile_form_totals) lists the priced (flag, price) column
+    pairs of each form; prices maps price columns to price_column results and
+    flags maps flag columns to bool lists. A form total is the sum of the prices
+    whose flag is set and price is above zero, summed in integer pence so it is
+    exact without per-row Decimal arithmetic. Rows where a counted price has
+    fractions of a penny get None and are totalled from the Decimals as before.
+    """
+    totals = {}
+    for form_type, priced_toggles in form_totals.items():
+        total_pence = np.zeros(rows, dtype='int64')
+        fractional = np.zeros(rows, dtype=bool)
+        for flag_column, price_column_name in priced_toggles:
+            _, pence, whole_pence = prices[price_column_name]
+            enabled = np.asarray(flags[flag_column], dtype=bool)
+            total_pence += np.where(enabled & whole_pence & (pence > 0), pence, 0)
+            fractional |= enabled & ~whole_pence
+        totals[form_type] = [
+            None if inexact else Decimal(int(pence)).scaleb(-2)
+            for pence, inexact in zip(total_pence.tolist(), fractional.tolist())
+        ]
+    return totals
+
+def prepare_import_records(df, form_totals=None):
+    """Coerce every mapped CSV column once and yield typed per-row records.
+
+    Records hold 'texts', 'counts', 'prices', 'flags', 'datetimes', 'phone_keys',
+    'form_totals', 'invalid' and 'row_number', with values as the safe_* helpers give.
+    """
+    text_columns = list(dict.fromkeys(CORE_TEXT_COLUMNS + FORM_FLAG_COLUMNS))
+    price_columns = list(dict.fromkeys(CORE_PRICE_COLUMNS + FORM_PRICE_COLUMNS))
+
+    invalid = {}
+    texts = {column: text_column(df, column).tolist() for column in text_columns}
+    counts = {column: int_column(df, column, invalid=invalid) for column in CORE_COUNT_COLUMNS}
+    priced = {column: price_column(df, column) for column in price_columns}
+    prices = {column: values[0] for column, values in priced.items()}
+    flags = {column: bool_column(df, column) for column in FORM_FLAG_COLUMNS}
+    totals = form_total_columns(priced, flags, form_totals, len(df)) if form_totals else {}
+    datetimes = {
+        column: (parse_datetime_column(df[column], column) if column in df else [None] * len(df))
+        for column in DATETIME_COLUMNS
+    }
+    phone_keys = {column: phone_key_column(df, column) for column in PHONE_COLUMNS}
+
+    for position, index in enumerate(df.index):
+        yield {
+            'row_number': index + 1,
+            'texts': {column: values[position] for column, values in texts.items()},
+            'counts': {column: values[position] for column, values in counts.items()},
+            'prices': {column: values[position] for column, values in prices.items()},
+            'flags': {column: values[position] for column, values in flags.items()},
+            'datetimes': {column: values[position] for column, values in datetimes.items()},
+            'phone_keys': {column: values[position] for column, values in phone_keys.items()},
+            'form_totals': {form_type: values[position] for form_type, values in totals.items()},
+            'invalid': invalid.get(position),
+        }
+
+def resolve_csv_schema(csv_path):
+    """Check the CSV header against CSV_SCHEMA and return read_csv options.
+
+    Missing required columns abort the import before any row is processed;
+    other missing columns fall back to defaults and unmapped columns are skipped.
+    """
+    header = list(pd.read_csv(csv_path, nrows=0).columns)
+    
+    missing = [column for column in CSV_SCHEMA if column not in header]
+    missing_required = [column for column in REQUIRED_CSV_COLUMNS if column in missing]
+    if missing_required:
+        raise ValueError(f"CSV is missing required columns: {missing_required}")
+    if missing:
+        logger.warning(f"⚠️  CSV is missing {len(missing)} mapped columns (defaults will be used): {missing}")
+    
+    unknown = [column for column in header if column not in CSV_SCHEMA]
+    if unknown:
+        logger.info(f"ℹ️  Skipping {len(unknown)} unmapped CSV columns: {unknown}")
+    
+    usecols = [column for column in header if column in CSV_SCHEMA]
+    logger.info(f"📋 CSV schema: parsing {len(usecols)} of {len(header)} columns")
+    return {'usecols': usecols, 'dtype': {column: CSV_SCHEMA[column] for column in usecols}}
+
+def iter_import_records(csv_path, chunk_size=0, read_options=None, form_totals=None, row_offset=0):
+    """Yield prepared records from the CSV, streaming chunk_size rows at a time.
+
+    With chunk_size=0 the whole file is loaded up front (the original behaviour).
+    read_options (see resolve_csv_schema) are passed through to read_csv and
+    form_totals to prepare_import_records. row_offset is the 0-based position of
+    the first row read (when read_options skip rows), so row numbers stay absolute.
+    """
+    read_options = read_options or {}
+    if chunk_size:
+        chunks = pd.read_csv(csv_path, chunksize=chunk_size, **read_options)
+    else:
+        chunks = [pd.read_csv(csv_path, **read_options)]
+    
+    for chunk in chunks:
+        if row_offset:
+            chunk.index = chunk.index + row_offset
+        yield from prepare_import_records(chunk, form_totals)
+
+def peak_memory_mb():
+    """Peak resident set size of this process in MB, or None if unavailable."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+# Enhanced format list with PowerApps formats prioritized
+DATETIME_FORMATS = [
+    '%Y-%m-%d %H:%M:%S.%f',    # "2024-08-23 11:00:00.000000"
+    '%Y-%m-%d %H:%M:%S',       # "2025-10-11 23:00:00"
+    '%Y-%m-%d %H:%M',          # "2025-10-11 23:00"
+    '%Y-%m-%d',                # "2025-10-11"
+    '%m/%d/%Y %I:%M:%S %p',    # "10/11/2025 11:00:00 AM"
+    '%m/%d/%Y %I:%M %p',       # "10/11/2025 11:00 AM"
+    '%m/%d/%Y %H:%M:%S',       # "10/11/2025 23:00:00"
+    '%m/%d/%Y %H:%M',          # "10/11/2025 23:00"
+    '%m/%d/%Y',                # "10/11/2025"
+    '%d/%m/%Y %H:%M:%S',       # "11/10/2025 23:00:00"
+    '%d/%m/%Y %H:%M',          # "11/10/2025 23:00"
+    '%d/%m/%Y',                # "11/10/2025"
+    '%Y-%m-%dT%H:%M:%S',       # "2025-10-11T23:00:00"
+    '%Y-%m-%dT%H:%M:%SZ',      # "2025-10-11T23:00:00Z"
+]
+
+# UK formats can match the same string as their US twin ("10/11/2025"); the US
+# format keeps precedence, so it is always tried immediately before the UK one.
+DATETIME_FORMAT_PRECEDENCE = {
+    '%d/%m/%Y %H:%M:%S': '%m/%d/%Y %H:%M:%S',
+    '%d/%m/%Y %H:%M': '%m/%d/%Y %H:%M',
+    '%d/%m/%Y': '%m/%d/%Y',
+}
+
+def _formats_trying_first(preferred):
+    """DATETIME_FORMATS reordered to try `preferred` first (after its US twin)."""
+    first = [preferred]
+    if preferred in DATETIME_FORMAT_PRECEDENCE:
+        first.insert(0, DATETIME_FORMAT_PRECEDENCE[preferred])
+    return tuple(first + [fmt for fmt in DATETIME_FORMATS if fmt not in first])
+
+DATETIME_FORMAT_ORDERS = {fmt: _formats_trying_first(fmt) for fmt in DATETIME_FORMATS}
+DATETIME_FORMAT_NUMBERS = {fmt: i + 1 for i, fmt in enumerate(DATETIME_FORMATS)}
+
+# Strings fromisoformat parses exactly like the matching ISO strptime formats above
+ISO_DATETIME_RE = re.compile(
+    r'\d{4}-\d{2}-\d{2}'
+    r'(?: (?:[01]\d|2[0-3]):\d{2}(?::\d{2}(?:\.\d{1,6})?)?|T(?:[01]\d|2[0-3]):\d{2}:\d{2})?'
+)
+ISO_FAST_PATH = 'fromisoformat'
+DATE_ONLY_FALLBACK = 'date-only fallback'
+UNPARSED = 'unparsed'
+
+NON_PRINTABLE_RE = re.compile(r'[^\x20-\x7E]')
+WHITESPACE_RE = re.compile(r'\s+')
+FRACTIONAL_SECONDS_RE = re.compile(r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\.(\d+)')
+FRACTIONAL_SECONDS_LINE_RE = re.compile(r'^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\.(\d+).*$', re.DOTALL)
+SLASH_DATE_TIME_SECONDS_RE = re.compile(r'(\d{1,2}/\d{1,2}/\d{4})\s+(\d{1,2}:\d{2}:\d{2}\s+[AP]M)')
+SLASH_DATE_TIME_RE = re.compile(r'(\d{1,2}/\d{1,2}/\d{4})\s+(\d{1,2}:\d{2}\s+[AP]M)')
+SLASH_DATE_RE = re.compile(r'(\d{1,2}/\d{1,2}/\d{4})')
+
+# Winning format per field name, and how often each format (or path) was used
+LEARNED_DATETIME_FORMATS = {}
+DATETIME_FORMAT_HITS = Counter()
+
 def normalize_datetime_string(date_str):
     """Enhanced string preprocessing for datetime parsing."""
     try:
@@ -101,108 +562,297 @@ def normalize_datetime_string(date_str):
             return None
         
         date_str = str(date_str).strip()
-        date_str = re.sub(r'[^\x20-\x7E]', '', date_str)
-        date_str = re.sub(r'\s+', ' ', date_str)
+        date_str = NON_PRINTABLE_RE.sub('', date_str)
+        date_str = WHITESPACE_RE.sub(' ', date_str)
         
         # Handle PowerApps formats
-        if re.match(r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.\d+', date_str):
-            match = re.match(r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\.(\d+)', date_str)
-            if match:
-                main_part = match.group(1)
-                microsec_part = match.group(2)[:6]
-                date_str = f"{main_part}.{microsec_part}"
+        match = FRACTIONAL_SECONDS_RE.match(date_str)
+        if match:
+            main_part = match.group(1)
+            microsec_part = match.group(2)[:6]
+            date_str = f"{main_part}.{microsec_part}"
         
-        date_str = re.sub(r'(\d{1,2}/\d{1,2}/\d{4})\s+(\d{1,2}:\d{2}:\d{2}\s+[AP]M)', r'\1 \2', date_str)
-        date_str = re.sub(r'(\d{1,2}/\d{1,2}/\d{4})\s+(\d{1,2}:\d{2}\s+[AP]M)', r'\1 \2', date_str)
+        date_str = SLASH_DATE_TIME_SECONDS_RE.sub(r'\1 \2', date_str)
+        date_str = SLASH_DATE_TIME_RE.sub(r'\1 \2', date_str)
         
-        logger.debug(f"Normalized datetime string: '{date_str}'")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Normalized datetime string: '%s'", date_str)
         return date_str.strip()
         
     except Exception as e:
-        logger.warning(f"Error normalizing datetime string '{date_str}': {e}")
+        logger.warning("Error normalizing datetime string '%s': %s", date_str, e)
         return str(date_str).strip() if date_str else None
 
 def parse_powerapp_datetime(date_str, field_name="unknown"):
-    """Parse PowerApps datetime with robust preprocessing and detailed logging."""
+    """Parse PowerApps datetime with robust preprocessing and detailed logging.
+
+    ISO strings take a datetime.fromisoformat fast path. Otherwise the format
+    that last succeeded for field_name is tried first, since an export uses one
+    or two formats per column; US-before-UK precedence is preserved.
+    """
     try:
+        debug = logger.isEnabledFor(logging.DEBUG)
+        info = logger.isEnabledFor(logging.INFO)
+        
         if pd.isna(date_str) or not date_str:
-            logger.debug(f"Empty datetime for field '{field_name}'")
+            if debug:
+                logger.debug("Empty datetime for field '%s'", field_name)
             return None
         
         original_str = str(date_str)
-        logger.info(f"🔍 Parsing datetime for field '{field_name}': '{original_str}'")
+        if info:
+            logger.info("🔍 Parsing datetime for field '%s': '%s'", field_name, original_str)
         
         normalized_str = normalize_datetime_string(date_str)
         if not normalized_str:
-            logger.warning(f"❌ Failed to normalize datetime string for '{field_name}': '{original_str}'")
+            logger.warning("❌ Failed to normalize datetime string for '%s': '%s'", field_name, original_str)
             return None
         
-        logger.debug(f"📝 Normalized: '{normalized_str}'")
-        
-        # Enhanced format list with PowerApps formats prioritized
-        formats = [
-            '%Y-%m-%d %H:%M:%S.%f',    # "2024-08-23 11:00:00.000000"
-            '%Y-%m-%d %H:%M:%S',       # "2025-10-11 23:00:00"
-            '%Y-%m-%d %H:%M',          # "2025-10-11 23:00"
-            '%Y-%m-%d',                # "2025-10-11"
-            '%m/%d/%Y %I:%M:%S %p',    # "10/11/2025 11:00:00 AM"
-            '%m/%d/%Y %I:%M %p',       # "10/11/2025 11:00 AM"
-            '%m/%d/%Y %H:%M:%S',       # "10/11/2025 23:00:00"
-            '%m/%d/%Y %H:%M',          # "10/11/2025 23:00"
-            '%m/%d/%Y',                # "10/11/2025"
-            '%d/%m/%Y %H:%M:%S',       # "11/10/2025 23:00:00"
-            '%d/%m/%Y %H:%M',          # "11/10/2025 23:00"
-            '%d/%m/%Y',                # "11/10/2025"
-            '%Y-%m-%dT%H:%M:%S',       # "2025-10-11T23:00:00"
-            '%Y-%m-%dT%H:%M:%SZ',      # "2025-10-11T23:00:00Z"
-        ]
+        if debug:
+            logger.debug("📝 Normalized: '%s'", normalized_str)
         
-        for i, fmt in enumerate(formats):
+        if ISO_DATETIME_RE.fullmatch(normalized_str):
+            try:
+                parsed_dt = datetime.fromisoformat(normalized_str)
+                DATETIME_FORMAT_HITS[ISO_FAST_PATH] += 1
+                if info:
+                    logger.info("✅ SUCCESS: Parsed '%s' using ISO fast path -> %s", normalized_str, parsed_dt)
+                return parsed_dt
+            except ValueError:
+                pass  # invalid date - let the format loop report it
+        
+        learned = LEARNED_DATETIME_FORMATS.get(field_name)
+        formats = DATETIME_FORMAT_ORDERS[learned] if learned else DATETIME_FORMATS
+        
+        for fmt in formats:
             try:
                 parsed_dt = datetime.strptime(normalized_str, fmt)
-                logger.info(f"✅ SUCCESS: Parsed '{normalized_str}' using format #{i+1}: '{fmt}' -> {parsed_dt}")
+                LEARNED_DATETIME_FORMATS[field_name] = fmt
+                DATETIME_FORMAT_HITS[fmt] += 1
+                if info:
+                    logger.info("✅ SUCCESS: Parsed '%s' using format #%d: '%s' -> %s",
+                                normalized_str, DATETIME_FORMAT_NUMBERS[fmt], fmt, parsed_dt)
                 return parsed_dt
             except ValueError as e:
-                logger.debug(f"❌ Format #{i+1} '{fmt}' failed: {e}")
+                if debug:
+                    logger.debug("❌ Format #%d '%s' failed: %s", DATETIME_FORMAT_NUMBERS[fmt], fmt, e)
                 continue
         
         # Fallback - extract date only
-        date_match = re.search(r'(\d{1,2}/\d{1,2}/\d{4})', normalized_str)
+        date_match = SLASH_DATE_RE.search(normalized_str)
         if date_match:
             date_part = date_match.group(1)
-            logger.info(f"🔄 Attempting date-only fallback: '{date_part}'")
+            if info:
+                logger.info("🔄 Attempting date-only fallback: '%s'", date_part)
             
             for fmt in ['%m/%d/%Y', '%d/%m/%Y']:
                 try:
                     parsed_date = datetime.strptime(date_part, fmt)
                     result = parsed_date.replace(hour=12, minute=0, second=0)
-                    logger.info(f"✅ FALLBACK SUCCESS: Extracted date '{date_part}' -> {result}")
+                    DATETIME_FORMAT_HITS[DATE_ONLY_FALLBACK] += 1
+                    if info:
+                        logger.info("✅ FALLBACK SUCCESS: Extracted date '%s' -> %s", date_part, result)
                     return result
                 except ValueError:
                     continue
         
-        logger.error(f"💥 COMPLETE FAILURE: Could not parse datetime '{original_str}' for field '{field_name}'")
+        DATETIME_FORMAT_HITS[UNPARSED] += 1
+        logger.error("💥 COMPLETE FAILURE: Could not parse datetime '%s' for field '%s'", original_str, field_name)
         return None
         
     except Exception as e:
-        logger.error(f"💥 EXCEPTION parsing datetime '{date_str}' for field '{field_name}': {e}")
-        logger.error(traceback.format_exc())
+        logger.exception("💥 EXCEPTION parsing datetime '%s' for field '%s': %s", date_str, field_name, e)
         return None
 
-def validate_database_schema(cursor):
+PARSE_DATETIME_CACHE = DatetimeParseCache(parse_powerapp_datetime)
+
+def normalize_datetime_column(series):
+    """Column-wise normalize_datetime_string; missing cells stay NaN."""
+    values = (
+        series[series.notna()].astype(str).str.strip()
+        .str.replace(NON_PRINTABLE_RE, '', regex=True)
+        .str.replace(WHITESPACE_RE, ' ', regex=True)
+        .str.replace(FRACTIONAL_SECONDS_LINE_RE, lambda m: f"{m.group(1)}.{m.group(2)[:6]}", regex=True)
+        .str.strip()
+    )
+    # The AM/PM spacing rules in normalize_datetime_string are no-ops once
+    # whitespace has been collapsed, so they are not repeated here.
+    return values.reindex(series.index)
+
+def parse_datetime_column(series, field_name="unknown"):
+    """Column-wise parse_powerapp_datetime returning a list of datetimes / None.
+
+    pd.to_datetime runs over the whole column once per entry of DATETIME_FORMATS,
+    in priority order (so %m/%d/%Y still wins over %d/%m/%Y), each pass only on
+    values no earlier format parsed. The residue goes through the memoized
+    parse_powerapp_datetime, i.e. the date-only fallback with its noon default.
+    """
+    series = series.reset_index(drop=True)
+    results = np.full(len(series), None, dtype=object)
+    
+    normalized = normalize_datetime_column(series)
+    pending = normalized[normalized.notna() & (normalized != '')]
+    for fmt in DATETIME_FORMATS:
+        if pending.empty:
+            break
+        parsed = pd.to_datetime(pending, format=fmt, errors='coerce')
+        hit = parsed.notna()
+        if hit.any():
+            results[pending.index[hit]] = np.asarray(parsed[hit].dt.to_pydatetime(), dtype=object)
+            DATETIME_FORMAT_HITS[fmt] += int(hit.sum())
+            pending = pending[~hit]
+    
+    residue = np.flatnonzero(pd.isna(results) & series.notna().to_numpy())
+    for position in residue:
+        results[position] = PARSE_DATETIME_CACHE(series.iloc[position], field_name)
+    
+    logger.info(f"📅 Parsed '{field_name}' column: {len(series) - len(residue)} vectorized, {len(residue)} via per-cell fallback")
+    return results.tolist()
+
+def log_datetime_format_hits():
+    """Log how many datetimes each format (or fallback path) parsed."""
+    if not DATETIME_FORMAT_HITS:
+        return
+    logger.info("📅 Datetime formats used:")
+    for fmt, hits in DATETIME_FORMAT_HITS.most_common():
+        logger.info(f"  - {fmt}: {hits}")
+
+# Local copy of the tenant's form_fields / event_ethnicity_options, keyed by
+# tenant id and tagged with the fingerprint they were fetched at
+REFERENCE_CACHE_FILE = 'reference_cache.json'
+
+# One round trip for everything the import needs before the first row: events
+# columns, active form fields, active ethnicity options, the tenant's customers
+# and whether the normalize_phone_e164 migration is applied. Each set comes back
+# as a JSON array (prices as text so they stay exact Decimals). The reference
+# tables are fingerprinted by row count, active count and latest updated_at, and
+# only sent when the fingerprint differs from %(cached_fingerprint)s.
+BOOTSTRAP_QUERY = """
+    WITH reference AS (
+        SELECT concat_ws('|',
+            (SELECT concat_ws(':', count(*), count(*) FILTER (WHERE is_active), max(updated_at))
+               FROM form_fields WHERE tenant_id = %(tenant_id)s),
+            (SELECT concat_ws(':', count(*), count(*) FILTER (WHERE is_active), max(updated_at))
+               FROM event_ethnicity_options WHERE tenant_id = %(tenant_id)s)
+        ) AS fingerprint
+    )
+    SELECT
+        (SELECT COALESCE(json_agg(json_build_object(
+                    'column_name', column_name, 'data_type', data_type, 'is_nullable', is_nullable
+                ) ORDER BY ordinal_position), '[]'::json)
+           FROM information_schema.columns 
+          WHERE table_name = 'events' AND table_schema = 'public') AS events_columns,
+        reference.fingerprint AS reference_fingerprint,
+        CASE WHEN reference.fingerprint = %(cached_fingerprint)s THEN NULL ELSE
+        (SELECT COALESCE(json_agg(json_build_object(
+                    'id', id, 'name', name, 'field_type', field_type,
+                    'has_pricing', has_pricing, 'default_price_gbp', default_price_gbp::text
+                ) ORDER BY name), '[]'::json)
+           FROM form_fields 
+          WHERE tenant_id = %(tenant_id)s AND is_active = true) END AS form_fields,
+        CASE WHEN reference.fingerprint = %(cached_fingerprint)s THEN NULL ELSE
+        (SELECT COALESCE(json_agg(json_build_object(
+                    'id', id, 'ethnicity_name', ethnicity_name
+                ) ORDER BY ethnicity_name), '[]'::json)
+           FROM event_ethnicity_options 
+          WHERE tenant_id = %(tenant_id)s AND is_active = true) END AS ethnicity_options,
+        (SELECT COALESCE(json_agg(json_build_object(
+                    'id', id, 'name', name, 'phone', phone, 'mobile', mobile
+                )), '[]'::json)
+           FROM customers 
+          WHERE tenant_id = %(tenant_id)s) AS customers,
+        to_regprocedure('public.normalize_phone_e164(text)') IS NOT NULL AS normalized_phone_sql
+    FROM reference
+"""
+
+def load_reference_cache(cache_file=REFERENCE_CACHE_FILE):
+    """Return this tenant's cached reference data, or None if absent or unreadable."""
+    try:
+        with open(cache_file, encoding='utf-8') as f:
+            return json.load(f).get(TENANT_ID)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring unreadable reference cache %s: %s", cache_file, e)
+        return None
+
+def save_reference_cache(reference, cache_file=REFERENCE_CACHE_FILE):
+    """Store this tenant's fingerprint, form_fields and ethnicity_options on disk."""
+    try:
+        with open(cache_file, encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+    
+    cache[TENANT_ID] = {
+        'fingerprint': reference['reference_fingerprint'],
+        'form_fields': reference['form_fields'],
+        'ethnicity_options': reference['ethnicity_options']
+    }
+    try:
+        temp_file = f"{cache_file}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+        os.replace(temp_file, cache_file)
+    except OSError as e:
+        logger.warning("Could not write reference cache %s: %s", cache_file, e)
+
+def bootstrap_import(cursor, customers_may_be_stale=False, reference_cache_file=REFERENCE_CACHE_FILE):
+    """Validate the schema and build every lookup structure from one query.
+
+    Form fields and ethnicity options come from reference_cache_file when its
+    fingerprint still matches the database (pass None to always fetch them).
+    Returns a dict with 'field_mappings', 'ethnicity_mappings',
+    'customer_index', 'reference_cache' ('hit', 'refreshed' or 'off') and
+    'seconds' (time spent in the round trip and the builds). Raises ValueError
+    when schema validation fails.
+    """
+    logger.info("🥾 Bootstrapping schema and mappings in one round trip...")
+    started = perf_counter()
+    
+    cached = load_reference_cache(reference_cache_file) if reference_cache_file else None
+    cursor.execute(BOOTSTRAP_QUERY, {
+        'tenant_id': TENANT_ID,
+        'cached_fingerprint': cached['fingerprint'] if cached else None
+    })
+    reference = cursor.fetchone()
+    
+    if not reference_cache_file:
+        cache_status = 'off'
+    elif reference['form_fields'] is None:
+        cache_status = 'hit'
+        reference['form_fields'] = cached['form_fields']
+        reference['ethnicity_options'] = cached['ethnicity_options']
+        logger.info("🗃️  Reference data unchanged - using %s", reference_cache_file)
+    else:
+        cache_status = 'refreshed'
+        logger.info("🗃️  Reference data changed - refreshing %s", reference_cache_file)
+    
+    if not validate_database_schema(reference['events_columns'], reference['form_fields'],
+                                    reference['ethnicity_options']):
+        raise ValueError("Database schema validation failed")
+    
+    if cache_status == 'refreshed':
+        save_reference_cache(reference, reference_cache_file)
+    
+    bootstrap = {
+        'field_mappings': build_form_field_mappings(reference['form_fields']),
+        'ethnicity_mappings': build_ethnicity_mappings(reference['ethnicity_options']),
+        'customer_index': build_customer_index(
+            reference['customers'], customers_may_be_stale, reference['normalized_phone_sql']
+        ),
+        'reference_cache': cache_status
+    }
+    bootstrap['seconds'] = perf_counter() - started
+    logger.info(f"🥾 Bootstrap complete in {bootstrap['seconds']:.2f}s")
+    return bootstrap
+
+def validate_database_schema(events_columns, form_fields, ethnicity_options):
     """Validate database schema before import."""
     logger.info("🔍 Validating database schema...")
     
     try:
         # Check events table structure
-        cursor.execute("""
-            SELECT column_name, data_type, is_nullable 
-            FROM information_schema.columns 
-            WHERE table_name = 'events' AND table_schema = 'public'
-            ORDER BY ordinal_position
-        """)
-        events_columns = cursor.fetchall()
-        
         required_events_fields = ['id', 'tenant_id', 'title', 'event_date', 'ethnicity']
         missing_fields = []
         
@@ -217,25 +867,13 @@ def validate_database_schema(cursor):
         logger.info(f"✅ Events table schema validated - {len(events_columns)} columns found")
         
         # Check form_fields table
-        cursor.execute("""
-            SELECT COUNT(*) as count FROM form_fields 
-            WHERE tenant_id = %s AND is_active = true
-        """, (TENANT_ID,))
-        
-        form_fields_count = cursor.fetchone()['count']
-        if form_fields_count == 0:
+        if len(form_fields) == 0:
             raise ValueError("No active form fields found for tenant")
         
-        logger.info(f"✅ Form fields validated - {form_fields_count} active fields found")
+        logger.info(f"✅ Form fields validated - {len(form_fields)} active fields found")
         
         # Check ethnicity options
-        cursor.execute("""
-            SELECT COUNT(*) as count FROM event_ethnicity_options 
-            WHERE tenant_id = %s AND is_active = true
-        """, (TENANT_ID,))
-        
-        ethnicity_count = cursor.fetchone()['count']
-        logger.info(f"✅ Ethnicity options validated - {ethnicity_count} options found")
+        logger.info(f"✅ Ethnicity options validated - {len(ethnicity_options)} options found")
         
         return True
         
@@ -243,18 +881,8 @@ def validate_database_schema(cursor):
         logger.error(f"❌ Schema validation failed: {e}")
         return False
 
-def load_form_field_mappings(cursor):
-    """Load form field mappings from database."""
-    logger.info("📚 Loading form field mappings...")
-    
-    cursor.execute("""
-        SELECT id, name, field_type, has_pricing, default_price_gbp 
-        FROM form_fields 
-        WHERE tenant_id = %s AND is_active = true
-        ORDER BY name
-    """, (TENANT_ID,))
-    
-    fields = cursor.fetchall()
+def build_form_field_mappings(fields):
+    """Build form field mappings from the bootstrap form_fields rows."""
     field_mappings = {}
     
     for field in fields:
@@ -263,34 +891,123 @@ def load_form_field_mappings(cursor):
             'name': field['name'],
             'field_type': field['field_type'],
             'has_pricing': field['has_pricing'],
-            'unit_price': field['default_price_gbp'] or 0
+            'unit_price': Decimal(field['default_price_gbp'] or '0') or 0
         }
     
     logger.info(f"📝 Loaded {len(field_mappings)} field mappings")
     return field_mappings
 
-def load_ethnicity_mappings(cursor):
-    """Load ethnicity mappings from database."""
-    logger.info("🌍 Loading ethnicity mappings...")
-    
-    cursor.execute("""
-        SELECT id, ethnicity_name 
-        FROM event_ethnicity_options 
-        WHERE tenant_id = %s AND is_active = true
-        ORDER BY ethnicity_name
-    """, (TENANT_ID,))
-    
-    ethnicities = cursor.fetchall()
+def build_ethnicity_mappings(ethnicities):
+    """Build ethnicity mappings from the bootstrap options and the matcher for them."""
     ethnicity_mappings = {}
     
     for ethnicity in ethnicities:
         ethnicity_mappings[ethnicity['ethnicity_name'].lower()] = ethnicity['id']
     
     logger.info(f"🌍 Loaded {len(ethnicity_mappings)} ethnicity mappings")
-    return ethnicity_mappings
+    return build_ethnicity_matcher(ethnicity_mappings)
+
+# Separators between ethnicities in strings like "Pakistani / Bengali" (words
+# such as "and" are not split on: option names like "White and Asian" use them)
+ETHNICITY_SEPARATOR_RE = re.compile(r'\s*[/,]\s*')
+
+def build_ethnicity_automaton(names):
+    """Build an Aho-Corasick automaton over names.
+
+    Returns (goto, fail, output) lists indexed by state; output[state] holds the
+    positions in names of every name ending at that state.
+    """
+    goto = [{}]
+    fail = [0]
+    output = [[]]
+    
+    for position, name in enumerate(names):
+        state = 0
+        for char in name:
+            next_state = goto[state].get(char)
+            if next_state is None:
+                goto.append({})
+                fail.append(0)
+                output.append([])
+                next_state = len(goto) - 1
+                goto[state][char] = next_state
+            state = next_state
+        output[state].append(position)
+    
+    pending = deque(goto[0].values())
+    while pending:
+        state = pending.popleft()
+        for char, next_state in goto[state].items():
+            pending.append(next_state)
+            fallback = fail[state]
+            while fallback and char not in goto[fallback]:
+                fallback = fail[fallback]
+            fail[next_state] = goto[fallback].get(char, 0)
+            output[next_state] = output[next_state] + output[fail[next_state]]
+    
+    return goto, fail, output
+
+def build_ethnicity_matcher(ethnicity_mappings):
+    """Precompute lookup structures for map_ethnicity_to_json.
+
+    ethnicity_mappings is {lowercase name: id} in option order. The matcher keeps
+    it as 'names', plus an Aho-Corasick automaton finding every option name
+    inside an input string, their 'lengths' and a table of every substring of
+    every option name (mapped to the first option containing it), so partial
+    matches no longer scan all options. Results are memoized per distinct input
+    in 'memo'.
+    """
+    names = list(ethnicity_mappings)
+    substrings = {}
+    for position, name in enumerate(names):
+        for start in range(len(name)):
+            for end in range(start + 1, len(name) + 1):
+                substrings.setdefault(name[start:end], position)
+    
+    return {
+        'names': ethnicity_mappings,
+        'ids': [ethnicity_mappings[name] for name in names],
+        'lengths': [len(name) for name in names],
+        'automaton': build_ethnicity_automaton(names),
+        'substrings': substrings,
+        'memo': {}
+    }
+
+def _match_ethnicities(text, matcher):
+    """Return the ids of the options named in text, in the order they appear.
+
+    Whole option names are taken longest first and may not overlap, so
+    "white and asian" is one option even when "asian" is one too. Text naming
+    no option maps to the first option containing it, if any.
+    """
+    goto, fail, output = matcher['automaton']
+    lengths = matcher['lengths']
+    found = []
+    state = 0
+    for end, char in enumerate(text, 1):
+        while state and char not in goto[state]:
+            state = fail[state]
+        state = goto[state].get(char, 0)
+        found.extend((end - lengths[position], end, position) for position in output[state])
+    
+    taken = []
+    for start, end, position in sorted(found, key=lambda match: (match[0] - match[1], match[0], match[2])):
+        if all(end <= other_start or start >= other_end for other_start, other_end, _ in taken):
+            taken.append((start, end, position))
+    
+    if not taken:
+        containing = matcher['substrings'].get(text)
+        return [matcher['ids'][containing]] if containing is not None else []
+    return [matcher['ids'][position] for _, _, position in sorted(taken)]
 
 def map_ethnicity_to_json(ethnicity_string, ethnicity_mappings):
-    """Convert ethnicity string to JSON array of ethnicity IDs."""
+    """Convert ethnicity string to JSON array of ethnicity IDs.
+
+    ethnicity_mappings is the matcher from build_ethnicity_mappings. An exact
+    option match wins; otherwise strings naming several ethnicities
+    ("Pakistani / Bengali", "White and Asian & Indian") map to every option
+    they name, and parts naming none to the first option containing them.
+    """
     if not ethnicity_string or pd.isna(ethnicity_string):
         return None
     
@@ -298,24 +1015,61 @@ def map_ethnicity_to_json(ethnicity_string, ethnicity_mappings):
     if not ethnicity_string:
         return None
     
-    # Try exact match first
-    if ethnicity_string in ethnicity_mappings:
-        return [ethnicity_mappings[ethnicity_string]]
+    memo = ethnicity_mappings['memo']
+    if ethnicity_string in memo:
+        return memo[ethnicity_string]
     
-    # Try partial matches
-    matches = []
-    for name, id in ethnicity_mappings.items():
-        if ethnicity_string in name or name in ethnicity_string:
-            matches.append(id)
+    # Try exact match first
+    if ethnicity_string in ethnicity_mappings['names']:
+        result = [ethnicity_mappings['names'][ethnicity_string]]
+    else:
+        matches = []
+        for part in ETHNICITY_SEPARATOR_RE.split(ethnicity_string):
+            if part:
+                matches.extend(_match_ethnicities(part, ethnicity_mappings))
+        result = list(dict.fromkeys(matches)) or None
     
-    if matches:
-        return matches[:1]  # Return first match
+    if result is None:
+        logger.warning("No ethnicity mapping found for: '%s'", ethnicity_string)
+    memo[ethnicity_string] = result
+    return result
+
+def build_customer_index(customers, check_database_on_miss=False, normalized_phone_sql=False):
+    """Build in-memory customer lookup dicts from the bootstrap customers rows.
+
+    'by_name' is keyed on the lower-cased name and 'by_phone' on the
+    normalize_phone_number key of the phone and mobile values, so differently
+    formatted copies of a number still match. With check_database_on_miss,
+    lookups that miss in memory are retried against the database (for when
+    customers may be added while the import runs); those queries use the
+    normalize_phone_e164 expression indexes when normalized_phone_sql is set.
+    """
+    by_name = {}
+    by_phone = {}
+    for customer in customers:
+        if customer['name']:
+            by_name.setdefault(customer['name'].lower(), customer['id'])
+        for number in (customer['phone'], customer['mobile']):
+            phone_key = normalize_phone_number(number)
+            if phone_key:
+                by_phone.setdefault(phone_key, customer['id'])
     
-    logger.warning(f"No ethnicity mapping found for: '{ethnicity_string}'")
-    return None
+    logger.info(f"👥 Indexed {len(customers)} customers ({len(by_name)} names, {len(by_phone)} phone numbers)")
+    return {
+        'by_name': by_name,
+        'by_phone': by_phone,
+        'check_database_on_miss': check_database_on_miss,
+        'normalized_phone_sql': check_database_on_miss and bool(normalized_phone_sql)
+    }
 
-def find_customer_by_contact(cursor, contact_name, contact_phone):
-    """Find existing customer by contact information."""
+def find_customer_by_contact(cursor, contact_name, contact_phone, customer_index=None, phone_key=None):
+    """Find existing customer by contact information.
+
+    With a customer_index (see build_customer_index) lookups are answered in
+    memory; the database is only queried when no index is given or the index
+    was loaded with check_database_on_miss. Phone numbers are compared by
+    normalize_phone_number key; pass phone_key when it is already computed.
+    """
     try:
         contact_name = safe_string(contact_name)
         contact_phone = safe_string(contact_phone)
@@ -323,6 +1077,18 @@ def find_customer_by_contact(cursor, contact_name, contact_phone):
         if not contact_name and not contact_phone:
             return None
         
+        if phone_key is None:
+            phone_key = normalize_phone_number(contact_phone)
+        
+        if customer_index is not None:
+            customer_id = None
+            if contact_name:
+                customer_id = customer_index['by_name'].get(contact_name.lower())
+            if not customer_id and phone_key:
+                customer_id = customer_index['by_phone'].get(phone_key)
+            if customer_id or not customer_index['check_database_on_miss']:
+                return customer_id
+        
         if contact_name:
             cursor.execute("""
                 SELECT id FROM customers 
@@ -333,7 +1099,17 @@ def find_customer_by_contact(cursor, contact_name, contact_phone):
             if result:
                 return result['id']
         
-        if contact_phone:
+        if phone_key and customer_index is not None and customer_index['normalized_phone_sql']:
+            cursor.execute("""
+                SELECT id FROM customers 
+                WHERE tenant_id = %s 
+                  AND (normalize_phone_e164(phone) = %s OR normalize_phone_e164(mobile) = %s)
+                LIMIT 1
+            """, (TENANT_ID, phone_key, phone_key))
+            result = cursor.fetchone()
+            if result:
+                return result['id']
+        elif contact_phone:
             cursor.execute("""
                 SELECT id FROM customers 
                 WHERE tenant_id = %s AND (phone = %s OR mobile = %s)
@@ -345,342 +1121,981 @@ def find_customer_by_contact(cursor, contact_name, contact_phone):
         
         return None
     except Exception as e:
-        logger.warning(f"Error finding customer: {e}")
+        logger.warning("Error finding customer: %s", e)
         return None
 
-def create_form_responses_corrected(row, form_type='nikkah', field_mappings=None):
-    """Create corrected form_responses JSON structure."""
+# Kinds of form field create_form_responses_corrected fills in (any other
+# field type gets an empty response)
+PRICED_TOGGLE = 'priced_toggle'
+DROPDOWN = 'dropdown'
+TEXT_NOTES = 'text_notes'
+
+def resolve_form_fields(field_mappings):
+    """Resolve POWERAPP_*_MAPPINGS against the tenant's form fields, once per import.
+
+    Returns {form_type: [(powerapp_field, price_field, field_id, kind)]} for the
+    mapped fields in mapping order, so the per-row loop does no lookups.
+    """
+    form_fields = {}
+    for form_type, powerapp_mappings in (('nikkah', POWERAPP_NIKKAH_MAPPINGS),
+                                         ('reception', POWERAPP_RECEPTION_MAPPINGS)):
+        resolved = []
+        for powerapp_field, (our_field, price_field) in powerapp_mappings.items():
+            field_info = (field_mappings or {}).get(our_field)
+            if field_info is None:
+                logger.debug("Field '%s' not found in mappings - skipping", our_field)
+                continue
+            
+            field_type = field_info['field_type']
+            if field_type == 'fixed_price_notes_toggle' and field_info['has_pricing']:
+                kind = PRICED_TOGGLE
+            elif field_type == 'dropdown_options':
+                kind = DROPDOWN
+            elif field_type == 'text_notes_only':
+                kind = TEXT_NOTES
+            else:
+                kind = None
+            resolved.append((powerapp_field, price_field, field_info['id'], kind))
+        
+        logger.info(f"🧩 {form_type.capitalize()} form: {len(resolved)} of {len(powerapp_mappings)} PowerApps fields mapped")
+        form_fields[form_type] = resolved
+    return form_fields
+
+def create_form_responses_corrected(row, form_type='nikkah', form_fields=None):
+    """Create corrected form_responses JSON structure from a prepared import record.
+
+    form_fields comes from resolve_form_fields. The record's precomputed form
+    total (see compile_form_totals) is used when it has one.
+    """
     form_responses = {}
     form_total = Decimal('0.00')
+    precomputed_total = row.get('form_totals', {}).get(form_type)
     
     try:
-        if not field_mappings:
+        if not form_fields:
             return {}, Decimal('0.00')
         
-        # PowerApps to internal field mappings with correct field names
-        if form_type == 'nikkah':
-            powerapp_mappings = {
-                'ma_nikahextrahoursyesno': ('extra_hour', 'ma_nikahextrahoursprice'),
-                'ma_nikahtopuplambyesno': ('extra_1', 'ma_nikahtopuplambprice'),  # Map to available fields
-                'ma_nikahwelcomedrinksyesno': ('extra_2', 'ma_nikahwelcomedrinksprice'),
-                'ma_nikahdesserttableyesno': ('dessert_table', 'ma_nikahdesserttableprice'),
-                'ma_nikahfruittableyesno': ('fruit_table', 'ma_nikahfruittableprice'),
-                'ma_nikahfullcutleryyesno': ('full_cutlery', 'ma_nikahfullcutleryprice'),
-                'ma_nikahfogandsparkleyesno': ('fog_and_sparkles', 'ma_nikahfogandsparkleprice'),
-                'ma_nikahfruityesno': ('fruit_baskets', 'ma_nikahfruitprice'),
-                'ma_nikahextra1yesno': ('extra_3', 'ma_nikahextra1price'),
-                'ma_nikahextra2yesno': ('extra_4', 'ma_nikahextra2price'),
-                'ma_nikahextra3yesno': ('extra_5', 'ma_nikahextra3price'),
-                'ma_nikahextra4yesno': ('extra_6', 'ma_nikahextra4price'),
-                'ma_nikahnotessection': ('notes_section', None)
-            }
-        else:  # reception
-            powerapp_mappings = {
-                'ma_themecolour': ('notes_section', None),  # Map theme to notes
-                'ma_stage': ('notes_section', None),
-                'ma_weddingfavours': ('notes_section', None),
-                'ma_centrepieces': ('centrepieces', None),
-                'ma_setup': ('setup', None),
-                'ma_dinnertime': ('dinner_time', None),
-                'ma_starter': ('notes_section', None),
-                'ma_maincourse': ('main_course', None),
-                'ma_dessert': ('dessert', None),
-                'ma_specialrequest1': ('special_request_1', None),
-                'ma_specialrequest2': ('special_request_2', None),
-                'ma_diningchairs': ('dining_chairs', None),
-                'ma_fullcutlery': ('full_cutlery', None),
-                'ma_cakefromnarmin': ('cake', 'ma_cakefromnarmin'),
-                'ma_carpetrunner': ('carpet_runner', 'ma_carpetrunner'),
-                'ma_desserttable': ('dessert_table', 'ma_desserttable'),
-                'ma_fruittable': ('fruit_table', 'ma_fruittable'),
-                'ma_receptionfogandsparkle': ('fog_and_sparkles', 'ma_receptionfogandsparkle'),
-                'ma_invitationbycard': ('invitation_by_card', 'ma_invitationbycard'),
-                'ma_password': ('password', 'ma_password'),
-                'ma_receptionextra1yesno': ('extra_1', 'ma_receptionextra1price'),
-                'ma_receptionextra2yesno': ('extra_2', 'ma_receptionextra2price'),
-                'ma_receptionextra3yesno': ('extra_3', 'ma_receptionextra3price'),
-                'ma_receptionextra4yesno': ('extra_4', 'ma_receptionextra4price'),
-                'ma_notessection': ('notes_section', None)
-            }
-        
-        for powerapp_field, mapping_data in powerapp_mappings.items():
-            our_field, price_field = mapping_data
+        flags, prices, texts = row['flags'], row['prices'], row['texts']
+        for powerapp_field, price_field, field_id, kind in form_fields[form_type]:
+            if kind == PRICED_TOGGLE:
+                enabled = flags[powerapp_field]
+                price = prices[price_field] if price_field else Decimal('0')
+                form_responses[field_id] = {'enabled': enabled, 'price': float(price), 'quantity': 1,
+                                            'notes': '', 'selections': []}
+                if enabled and price > 0 and precomputed_total is None:
+                    form_total += price
             
-            if our_field not in field_mappings:
-                logger.debug(f"Field '{our_field}' not found in mappings - skipping")
-                continue
-                
-            field_info = field_mappings[our_field]
-            field_id = field_info['id']
-            field_type = field_info['field_type']
+            elif kind == DROPDOWN:
+                selection = texts[powerapp_field]
+                form_responses[field_id] = {'enabled': bool(selection), 'price': 0, 'quantity': 1,
+                                            'notes': selection, 'selections': [selection] if selection else []}
             
-            # Create base field response structure
-            field_response = {
-                'enabled': False,
-                'price': 0,
-                'quantity': 1,
-                'notes': '',
-                'selections': []
-            }
+            elif kind == TEXT_NOTES:
+                text_value = texts[powerapp_field]
+                form_responses[field_id] = {'enabled': bool(text_value), 'price': 0, 'quantity': 1,
+                                            'notes': text_value, 'selections': []}
             
-            # Handle different field types based on actual database schema
-            if field_type == 'fixed_price_notes_toggle' and field_info['has_pricing']:
-                enabled = safe_bool(row.get(powerapp_field, False))
-                price = safe_decimal(row.get(price_field, 0)) if price_field else Decimal('0')
-                
-                field_response['enabled'] = enabled
-                field_response['price'] = float(price)
-                
-                if enabled and price > 0:
-                    form_total += price
-                    
-            elif field_type == 'dropdown_options':
-                selection = safe_string(row.get(powerapp_field, ''))
-                field_response['enabled'] = bool(selection)
-                field_response['selections'] = [selection] if selection else []
-                field_response['notes'] = selection
-                
-            elif field_type == 'text_notes_only':
-                text_value = safe_string(row.get(powerapp_field, ''))
-                field_response['enabled'] = bool(text_value)
-                field_response['notes'] = text_value
-            
-            form_responses[field_id] = field_response
+            else:
+                form_responses[field_id] = {'enabled': False, 'price': 0, 'quantity': 1,
+                                            'notes': '', 'selections': []}
         
-        logger.debug(f"Created {form_type} responses: {len(form_responses)} fields, total: £{form_total}")
+        if precomputed_total is not None:
+            form_total = precomputed_total
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Created %s responses: %d fields, total: £%s", form_type, len(form_responses), form_total)
         return form_responses, form_total
     
     except Exception as e:
-        logger.error(f"Error creating form responses for {form_type}: {e}")
-        logger.error(traceback.format_exc())
+        logger.exception("Error creating form responses for %s: %s", form_type, e)
         return {}, Decimal('0.00')
 
-def import_all_days_events():
-    """Main import function with schema compliance."""
-    logger.info("🚀 Starting CORRECTED All Days import process...")
+def compile_form_totals(form_fields):
+    """Priced (flag column, price column) pairs per form type, for form_total_columns."""
+    return {
+        form_type: [(powerapp_field, price_field)
+                    for powerapp_field, price_field, _, kind in resolved
+                    if kind == PRICED_TOGGLE and price_field]
+        for form_type, resolved in form_fields.items()
+    }
+
+EVENT_COLUMNS = [
+    'id', 'tenant_id', 'customer_id', 'title', 'event_type',
+    'event_date', 'event_end_date',
+    'start_time', 'end_time',
+    'men_count', 'ladies_count',
+    'total_guest_price_gbp', 'deposit_amount_gbp',
+    'primary_contact_name', 'primary_contact_number',
+    'ethnicity', 'form_total_gbp',
+    'created_at', 'updated_at'
+]
+
+EVENT_FORM_COLUMNS = [
+    'id', 'tenant_id', 'event_id', 'form_id',
+    'form_label', 'tab_order', 'form_responses', 'form_total',
+    'men_count', 'ladies_count', 'guest_count',
+    'is_active', 'created_at', 'updated_at'
+]
+
+# Rows get ids derived from their content (see import_event_id) and are written
+# as upserts, so rerunning an interrupted import refreshes rows it already wrote
+# instead of duplicating them
+IMPORT_ID_NAMESPACE = uuid.UUID('0c720235-e5fa-49bc-ae81-64da3f377239')
+
+def _upsert_clause(columns):
+    return "ON CONFLICT (id) DO UPDATE SET " + ", ".join(
+        f"{column} = EXCLUDED.{column}" for column in columns if column not in ('id', 'created_at')
+    )
+
+EVENT_UPSERT = _upsert_clause(EVENT_COLUMNS)
+EVENT_FORM_UPSERT = _upsert_clause(EVENT_FORM_COLUMNS)
+
+# Record columns named in the event id key; every other imported value is
+# folded in as a whole
+EVENT_KEY_TEXT_COLUMNS = ('ma_title', 'ma_primarycontactname', 'ma_primarycontactnumber')
+
+def import_event_id(row):
+    """Deterministic events.id for an imported record.
+
+    Keyed on tenant, title, start, contact name and normalized contact number,
+    plus the record's other imported values, so two bookings sharing a title
+    and start stay separate events and only genuinely identical rows merge.
+    """
+    texts = row['texts']
+    contact_number = row['phone_keys']['ma_primarycontactnumber'] or texts['ma_primarycontactnumber']
+    details = (
+        [value for column, value in texts.items() if column not in EVENT_KEY_TEXT_COLUMNS],
+        row['counts'], row['prices'], row['flags'], row['datetimes']
+    )
+    return str(uuid.uuid5(IMPORT_ID_NAMESPACE, (
+        f"{TENANT_ID}|{texts['ma_title']}|{row['datetimes']['ma_nikahstartdatetime'].isoformat()}|"
+        f"{texts['ma_primarycontactname'].lower()}|{contact_number}|{details!r}"
+    )))
+
+def import_form_id(event_id, form_id):
+    """Deterministic event_forms.id for one form of an imported event."""
+    return str(uuid.uuid5(IMPORT_ID_NAMESPACE, f"{event_id}|{form_id}"))
+
+def build_event_payload(row, cursor, form_fields, ethnicity_mappings, customer_index=None):
+    """Build the events row and its Nikkah/Reception event_forms rows for one record.
+
+    Everything is computed before any write: form responses, form totals and
+    guest prices land in the events row itself.
+
+    Returns None when no valid start date can be parsed (the row is skipped).
+    """
+    # Validate required fields
+    event_name = row['texts']['ma_title']
+    if not event_name:
+        raise ValueError("Missing event name (ma_title)")
+    if row.get('invalid'):
+        raise ValueError(row['invalid'])
+    
+    # Extract contact information
+    primary_contact = row['texts']['ma_primarycontactname']
+    primary_phone = row['texts']['ma_primarycontactnumber']
+    
+    # Find existing customer
+    customer_id = find_customer_by_contact(
+        cursor, primary_contact, primary_phone, customer_index,
+        phone_key=row['phone_keys']['ma_primarycontactnumber']
+    )
+    
+    # Dates (parsed column-wise in prepare_import_records)
+    event_start_datetime = row['datetimes']['ma_nikahstartdatetime']
+    event_end_datetime = row['datetimes']['ma_nikahendatetime']
+    
+    if not event_start_datetime:
+        logger.error("❌ No valid start date found for '%s' - SKIPPING", event_name)
+        return None
+    
+    event_start_date = event_start_datetime.date()
+    start_time_obj = event_start_datetime.time()
+    
+    if event_end_datetime:
+        event_end_date = event_end_datetime.date()
+        end_time_obj = event_end_datetime.time()
+    else:
+        event_end_date = event_start_date
+        end_hour = (event_start_datetime.hour + 4) % 24
+        end_time_obj = time(end_hour, event_start_datetime.minute)
+    
+    # Guest counts
+    nikkah_men = row['counts']['ma_nikahmencount']
+    nikkah_ladies = row['counts']['ma_nikahladiescount']
+    reception_men = row['counts']['ma_receptionmencount']
+    reception_ladies = row['counts']['ma_receptionladiescount']
+    
+    # Financial data
+    nikkah_guest_price = row['prices']['ma_nikahtotalguestprice']
+    reception_guest_price = row['prices']['ma_receptiontotalguestprice']
+    total_guest_price = nikkah_guest_price + reception_guest_price
+    deposit_amount = row['prices']['ma_depositamount']
+    
+    # Handle ethnicity properly as JSON
+    ethnicity_string = row['texts']['ma_ethnicity']
+    ethnicity_json = map_ethnicity_to_json(ethnicity_string, ethnicity_mappings)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Ethnicity: '%s' -> %s", ethnicity_string, ethnicity_json)
+    
+    # Create Nikkah and Reception form responses
+    nikkah_responses, nikkah_total = create_form_responses_corrected(
+        row, 'nikkah', form_fields
+    )
+    reception_responses, reception_total = create_form_responses_corrected(
+        row, 'reception', form_fields
+    )
+    total_form_amount = nikkah_total + reception_total
+    
+    event_id = import_event_id(row)
+    now = datetime.now()
+    
+    # Use reception counts for main event (as it's usually the larger number)
+    event = {
+        'id': event_id,
+        'tenant_id': TENANT_ID,
+        'customer_id': customer_id,
+        'title': event_name,
+        'event_type': ALL_DAY_EVENT_TYPE,
+        'event_date': event_start_date,
+        'event_end_date': event_end_date,
+        'start_time': start_time_obj,
+        'end_time': end_time_obj,
+        'men_count': reception_men,
+        'ladies_count': reception_ladies,
+        'total_guest_price_gbp': float(total_guest_price),
+        'deposit_amount_gbp': float(deposit_amount),
+        'primary_contact_name': primary_contact,
+        'primary_contact_number': primary_phone,
+        'ethnicity': json.dumps(ethnicity_json) if ethnicity_json else None,
+        'form_total_gbp': float(total_form_amount),
+        'created_at': now,
+        'updated_at': now
+    }
+    
+    forms = []
+    for form_id, label, tab_order, responses, form_total, men, ladies in [
+        (NIKKAH_FORM_ID, 'Nikkah', 1, nikkah_responses, nikkah_total, nikkah_men, nikkah_ladies),
+        (RECEPTION_FORM_ID, 'Reception', 2, reception_responses, reception_total, reception_men, reception_ladies),
+    ]:
+        forms.append({
+            'id': import_form_id(event_id, form_id),
+            'tenant_id': TENANT_ID,
+            'event_id': event_id,
+            'form_id': form_id,
+            'form_label': label,
+            'tab_order': tab_order,
+            'form_responses': json.dumps(responses),
+            'form_total': float(form_total),
+            'men_count': men,
+            'ladies_count': ladies,
+            'guest_count': men + ladies,
+            'is_active': True,
+            'created_at': now,
+            'updated_at': now
+        })
+    
+    return {
+        'row_number': row['row_number'],
+        'event_name': event_name,
+        'event_start_date': event_start_date,
+        'form_total': total_form_amount,
+        'event': event,
+        'forms': forms
+    }
+
+def insert_event_payload(cursor, payload):
+    """Write one built event and its forms with individual statements.
+
+    The events row is inserted fully populated (form_total_gbp included), so no
+    follow-up UPDATE is needed. Rows already present (same id) are updated.
+    """
+    event = payload['event']
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("💾 Inserting event: '%s' on %s", payload['event_name'], payload['event_start_date'])
+    
+    cursor.execute(
+        f"INSERT INTO events ({', '.join(EVENT_COLUMNS)}) "
+        f"VALUES ({', '.join(['%s'] * len(EVENT_COLUMNS))}) {EVENT_UPSERT}",
+        tuple(event[column] for column in EVENT_COLUMNS)
+    )
+    
+    for form in payload['forms']:
+        cursor.execute(
+            f"INSERT INTO event_forms ({', '.join(EVENT_FORM_COLUMNS)}) "
+            f"VALUES ({', '.join(['%s'] * len(EVENT_FORM_COLUMNS))}) {EVENT_FORM_UPSERT}",
+            tuple(form[column] for column in EVENT_FORM_COLUMNS)
+        )
+
+# Savepoint wrapped around each row when several rows share one transaction
+ROW_SAVEPOINT = 'import_row'
+
+def flush_event_batch(cursor, batch):
+    """Write a batch of built events with one multi-row INSERT per table."""
+    execute_values(
+        cursor,
+        f"INSERT INTO events ({', '.join(EVENT_COLUMNS)}) VALUES %s {EVENT_UPSERT}",
+        [tuple(payload['event'][column] for column in EVENT_COLUMNS) for payload in batch],
+        page_size=len(batch)
+    )
+    
+    form_rows = [
+        tuple(form[column] for column in EVENT_FORM_COLUMNS)
+        for payload in batch
+        for form in payload['forms']
+    ]
+    execute_values(
+        cursor,
+        f"INSERT INTO event_forms ({', '.join(EVENT_FORM_COLUMNS)}) VALUES %s {EVENT_FORM_UPSERT}",
+        form_rows,
+        page_size=len(form_rows)
+    )
+
+def write_event_batch(conn, batch):
+    """Flush and commit a batch; if the batch fails, retry its rows one by one.
+
+    Rows sharing an event id (identical rows) are written once, from the
+    last of them, as sequential upserts would leave it; a multi-row ON CONFLICT
+    cannot update the same id twice. The retry runs in a single transaction
+    with a savepoint around each event, so bad rows are rolled back and reported
+    while the rest commit together. Returns (committed row numbers, errors);
+    merged rows share the outcome of the row they were merged into.
+    """
+    rows_by_event = {}
+    for payload in batch:
+        rows_by_event.setdefault(payload['event']['id'], []).append(payload['row_number'])
+    events = list({payload['event']['id']: payload for payload in batch}.values())
     
     try:
-        # Load CSV file
-        logger.info("📂 Loading CSV file...")
-        df = pd.read_csv('ma_alldaies.csv')
-        logger.info(f"📊 Loaded {len(df)} records from CSV")
-        
-        # Connect to database
-        logger.info("🔌 Connecting to database...")
-        conn = psycopg2.connect(**DB_CONFIG)
-        conn.autocommit = False
-        
-        with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-            # Validate schema first
-            if not validate_database_schema(cursor):
-                raise ValueError("Database schema validation failed")
-            
-            # Load mappings
-            field_mappings = load_form_field_mappings(cursor)
-            ethnicity_mappings = load_ethnicity_mappings(cursor)
-        
-        success_count = 0
-        error_count = 0
-        errors = []
-        
-        logger.info("📝 Starting corrected import process...")
-        
-        for index, row in df.iterrows():
+        with conn.cursor() as cursor:
+            flush_event_batch(cursor, events)
+        conn.commit()
+        logger.info(f"✅ Flushed batch of {len(events)} events (rows {batch[0]['row_number']}-{batch[-1]['row_number']})")
+        return [payload['row_number'] for payload in batch], []
+    except Exception as e:
+        conn.rollback()
+        logger.warning(f"⚠️  Batch of {len(events)} events failed ({e}) - retrying row by row")
+    
+    inserted = []
+    errors = []
+    with conn.cursor() as cursor:
+        for payload in events:
+            row_numbers = rows_by_event[payload['event']['id']]
             try:
-                logger.info(f"📝 Processing row {index + 1}/{len(df)}")
-                
-                with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                with row_savepoint(cursor):
+                    insert_event_payload(cursor, payload)
+                inserted.extend(row_numbers)
+            except Exception as e:
+                error_msg = f"Row {payload['row_number']}: {str(e)}"
+                logger.error("❌ Error importing: %s", error_msg)
+                errors.extend(f"Row {row_number}: {str(e)}" for row_number in row_numbers)
+    
+    return ([] if commit_rows(conn, inserted, errors) else sorted(inserted)), errors
+
+@contextmanager
+def row_savepoint(cursor):
+    """Run the block inside a savepoint; if it raises, only its work is rolled back."""
+    cursor.execute(f"SAVEPOINT {ROW_SAVEPOINT}")
+    try:
+        yield
+    except Exception:
+        cursor.execute(f"ROLLBACK TO SAVEPOINT {ROW_SAVEPOINT}")
+        raise
+    cursor.execute(f"RELEASE SAVEPOINT {ROW_SAVEPOINT}")
+
+def commit_rows(conn, row_numbers, errors):
+    """Commit the open transaction holding row_numbers.
+
+    If the commit fails, every one of those rows is lost: each gets an error
+    appended to errors and the lost row numbers are returned.
+    """
+    try:
+        conn.commit()
+        return []
+    except Exception as e:
+        conn.rollback()
+        logger.error("❌ Commit failed, %d rows rolled back: %s", len(row_numbers), e)
+        errors.extend(f"Row {row_number}: commit failed: {e}" for row_number in row_numbers)
+        return list(row_numbers)
+
+def tally_committed(payloads, committed, seen_events):
+    """Count the committed payloads as (imported, duplicates).
+
+    Event ids come from the row's content (see import_event_id), so a row
+    identical to an earlier committed row only rewrote that event: it is a
+    duplicate, not another import. seen_events maps event id -> first row number
+    and is updated.
+    """
+    committed = set(committed)
+    imported = duplicates = 0
+    for payload in payloads:
+        row_number = payload['row_number']
+        if row_number not in committed:
+            continue
+        first_row = seen_events.setdefault(payload['event']['id'], row_number)
+        if first_row == row_number:
+            imported += 1
+        else:
+            duplicates += 1
+            logger.warning(f"⚠️  Row {row_number}: identical to row {first_row} - merged into one event")
+    return imported, duplicates
+
+def import_records(conn, records, form_fields, ethnicity_mappings, customer_index,
+                   batch_size=0, total_rows='?', commit_interval=0, checkpoint=None, seen_events=None):
+    """Import prepared records on one connection -> (success_count, error_count, errors, duplicate_count)."""
+    success_count = 0
+    duplicate_count = 0
+    error_count = 0
+    errors = []
+    batch = []
+    pending = []  # payloads inserted since the last commit (savepoint mode)
+    seen_events = {} if seen_events is None else seen_events
+    use_savepoints = bool(commit_interval) and not batch_size
+    resumed = checkpoint is not None and checkpoint['resumed']
+    log_rows = logger.isEnabledFor(logging.INFO)
+    
+    if use_savepoints:
+        logger.info(f"🧷 Savepoint mode: committing every {commit_interval} rows")
+    
+    for row in records:
+        row_number = row['row_number']
+        try:
+            if log_rows:
+                logger.info("📝 Processing row %s/%s", row_number, total_rows)
+            
+            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                if use_savepoints:
+                    isolation = row_savepoint(cursor)
+                else:
                     # Start new transaction
                     conn.rollback()
-                    
-                    # Validate required fields
-                    event_name = safe_string(row.get('ma_title', ''))
-                    if not event_name:
-                        raise ValueError("Missing event name (ma_title)")
-                    
-                    # Extract contact information
-                    primary_contact = safe_string(row.get('ma_primarycontactname', ''))
-                    primary_phone = safe_string(row.get('ma_primarycontactnumber', ''))
-                    
-                    # Find existing customer
-                    customer_id = find_customer_by_contact(cursor, primary_contact, primary_phone)
-                    
-                    # Parse dates
-                    event_start_datetime = parse_powerapp_datetime(
-                        row.get('ma_nikahstartdatetime'), 
-                        'ma_nikahstartdatetime'
-                    )
-                    event_end_datetime = parse_powerapp_datetime(
-                        row.get('ma_nikahendatetime'), 
-                        'ma_nikahendatetime'
+                    isolation = nullcontext()
+                
+                with isolation:
+                    payload = build_event_payload(
+                        row, cursor, form_fields, ethnicity_mappings, customer_index
                     )
-                    
-                    if event_start_datetime:
-                        event_start_date = event_start_datetime.date()
-                        start_time_obj = event_start_datetime.time()
-                        
-                        if event_end_datetime:
-                            event_end_date = event_end_datetime.date()
-                            end_time_obj = event_end_datetime.time()
-                        else:
-                            event_end_date = event_start_date
-                            end_hour = (event_start_datetime.hour + 4) % 24
-                            end_time_obj = time(end_hour, event_start_datetime.minute)
-                    else:
-                        logger.error(f"❌ No valid start date found for '{event_name}' - SKIPPING")
+                    if payload is None:
                         error_count += 1
-                        errors.append(f"Row {index + 1}: No valid start date for event '{event_name}'")
+                        errors.append(f"Row {row_number}: No valid start date for event '{row['texts']['ma_title']}'")
                         continue
                     
-                    # Guest counts
-                    nikkah_men = safe_int(row.get('ma_nikahmencount', 0))
-                    nikkah_ladies = safe_int(row.get('ma_nikahladiescount', 0))
-                    reception_men = safe_int(row.get('ma_receptionmencount', 0))
-                    reception_ladies = safe_int(row.get('ma_receptionladiescount', 0))
-                    
-                    # Use reception counts for main event (as it's usually the larger number)
-                    event_men_count = reception_men
-                    event_ladies_count = reception_ladies
-                    
-                    # Financial data
-                    nikkah_guest_price = safe_decimal(row.get('ma_nikahtotalguestprice', 0))
-                    reception_guest_price = safe_decimal(row.get('ma_receptiontotalguestprice', 0))
-                    total_guest_price = nikkah_guest_price + reception_guest_price
-                    deposit_amount = safe_decimal(row.get('ma_depositamount', 0))
-                    
-                    # Handle ethnicity properly as JSON
-                    ethnicity_string = safe_string(row.get('ma_ethnicity', ''))
-                    ethnicity_json = map_ethnicity_to_json(ethnicity_string, ethnicity_mappings)
-                    
-                    # Create event record with correct field names and proper JSON handling
-                    event_id = str(uuid.uuid4())
-                    
-                    logger.info(f"💾 Inserting event: '{event_name}' on {event_start_date}")
-                    logger.debug(f"Ethnicity: '{ethnicity_string}' -> {ethnicity_json}")
-                    
-                    cursor.execute("""
-                        INSERT INTO events (
-                            id, tenant_id, customer_id, title, event_type, 
-                            event_date, event_end_date,
-                            start_time, end_time,
-                            men_count, ladies_count,
-                            total_guest_price_gbp, deposit_amount_gbp,
-                            primary_contact_name, primary_contact_number,
-                            ethnicity,
-                            created_at, updated_at
-                        ) VALUES (
-                            %s, %s, %s, %s, %s,
-                            %s, %s,
-                            %s, %s,
-                            %s, %s,
-                            %s, %s,
-                            %s, %s,
-                            %s,
-                            %s, %s
-                        )
-                    """, (
-                        event_id, TENANT_ID, customer_id, event_name, ALL_DAY_EVENT_TYPE,
-                        event_start_date, event_end_date,
-                        start_time_obj, end_time_obj,
-                        event_men_count, event_ladies_count,
-                        float(total_guest_price), float(deposit_amount),
-                        primary_contact, primary_phone,
-                        json.dumps(ethnicity_json) if ethnicity_json else None,
-                        datetime.now(), datetime.now()
-                    ))
-                    
-                    # Create Nikkah form responses
-                    nikkah_responses, nikkah_total = create_form_responses_corrected(
-                        row, 'nikkah', field_mappings
-                    )
-                    
-                    # Create Reception form responses
-                    reception_responses, reception_total = create_form_responses_corrected(
-                        row, 'reception', field_mappings
-                    )
-                    
-                    # Create Nikkah event form
-                    nikkah_form_id = str(uuid.uuid4())
-                    cursor.execute("""
-                        INSERT INTO event_forms (
-                            id, tenant_id, event_id, form_id,
-                            form_label, tab_order, form_responses, form_total,
-                            men_count, ladies_count, guest_count,
-                            is_active, created_at, updated_at
-                        ) VALUES (
-                            %s, %s, %s, %s,
-                            %s, %s, %s, %s,
-                            %s, %s, %s,
-                            %s, %s, %s
-                        )
-                    """, (
-                        nikkah_form_id, TENANT_ID, event_id, NIKKAH_FORM_ID,
-                        'Nikkah', 1, json.dumps(nikkah_responses), float(nikkah_total),
-                        nikkah_men, nikkah_ladies, nikkah_men + nikkah_ladies,
-                        True, datetime.now(), datetime.now()
-                    ))
-                    
-                    # Create Reception event form
-                    reception_form_id = str(uuid.uuid4())
-                    cursor.execute("""
-                        INSERT INTO event_forms (
-                            id, tenant_id, event_id, form_id,
-                            form_label, tab_order, form_responses, form_total,
-                            men_count, ladies_count, guest_count,
-                            is_active, created_at, updated_at
-                        ) VALUES (
-                            %s, %s, %s, %s,
-                            %s, %s, %s, %s,
-                            %s, %s, %s,
-                            %s, %s, %s
-                        )
-                    """, (
-                        reception_form_id, TENANT_ID, event_id, RECEPTION_FORM_ID,
-                        'Reception', 2, json.dumps(reception_responses), float(reception_total),
-                        reception_men, reception_ladies, reception_men + reception_ladies,
-                        True, datetime.now(), datetime.now()
-                    ))
-                    
-                    # Update event with calculated totals
-                    total_form_amount = nikkah_total + reception_total
-                    total_event_amount = total_guest_price + total_form_amount
-                    
-                    cursor.execute("""
-                        UPDATE events SET 
-                            form_total_gbp = %s,
-                            updated_at = %s
-                        WHERE id = %s
-                    """, (
-                        float(total_form_amount),
-                        datetime.now(),
-                        event_id
-                    ))
+                    if batch_size:
+                        batch.append(payload)
+                        if len(batch) >= batch_size:
+                            committed, batch_errors = write_event_batch(conn, batch)
+                            record_checkpoint(checkpoint, committed)
+                            imported, duplicates = tally_committed(batch, committed, seen_events)
+                            success_count += imported
+                            duplicate_count += duplicates
+                            error_count += len(batch_errors)
+                            errors.extend(batch_errors)
+                            batch = []
+                        continue
                     
+                    insert_event_payload(cursor, payload)
+                
+                if use_savepoints:
+                    pending.append(payload)
+                    if len(pending) >= commit_interval:
+                        pending_rows = [pending_payload['row_number'] for pending_payload in pending]
+                        lost = commit_rows(conn, pending_rows, errors)
+                        if not lost:
+                            record_checkpoint(checkpoint, pending_rows)
+                            imported, duplicates = tally_committed(pending, pending_rows, seen_events)
+                            success_count += imported
+                            duplicate_count += duplicates
+                        error_count += len(lost)
+                        pending = []
+                else:
                     # Commit transaction
                     conn.commit()
-                    success_count += 1
-                    logger.info(f"✅ Successfully imported: '{event_name}' with £{total_form_amount} forms total")
-                    
+                    record_checkpoint(checkpoint, [row_number])
+                    imported, duplicates = tally_committed([payload], [row_number], seen_events)
+                    success_count += imported
+                    duplicate_count += duplicates
+                if log_rows:
+                    logger.info("✅ Successfully imported: '%s' with £%s forms total",
+                                payload['event_name'], payload['form_total'])
+                
+        except Exception as e:
+            if not use_savepoints or conn.get_transaction_status() == TRANSACTION_STATUS_INERROR:
+                # Outside a savepoint the whole open transaction is gone
+                conn.rollback()
+                if pending:
+                    errors.extend(f"Row {lost_payload['row_number']}: rolled back with row {row_number}" for lost_payload in pending)
+                    error_count += len(pending)
+                    pending = []
+            error_msg = f"Row {row_number}: {str(e)}"
+            logger.exception("❌ Error importing: %s", error_msg)
+            errors.append(error_msg)
+            error_count += 1
+            
+            # Stop after 5 consecutive errors to avoid flooding (a resumed
+            # import already proved the setup works, and mostly failed rows remain)
+            if error_count >= 5 and success_count + duplicate_count + len(batch) + len(pending) == 0 and not resumed:
+                logger.error("💥 Too many consecutive errors - stopping import")
+                break
+            continue
+    
+    if batch:
+        committed, batch_errors = write_event_batch(conn, batch)
+        record_checkpoint(checkpoint, committed)
+        imported, duplicates = tally_committed(batch, committed, seen_events)
+        success_count += imported
+        duplicate_count += duplicates
+        error_count += len(batch_errors)
+        errors.extend(batch_errors)
+    
+    if pending:
+        pending_rows = [pending_payload['row_number'] for pending_payload in pending]
+        lost = commit_rows(conn, pending_rows, errors)
+        if not lost:
+            record_checkpoint(checkpoint, pending_rows)
+            imported, duplicates = tally_committed(pending, pending_rows, seen_events)
+            success_count += imported
+            duplicate_count += duplicates
+        error_count += len(lost)
+    
+    return success_count, error_count, errors, duplicate_count
+
+# --pipeline-depth: rows per writer batch when --batch-size is not given, and how
+# often the writer reports progress
+PIPELINE_BATCH_SIZE = 100
+PIPELINE_REPORT_SECONDS = 5.0
+
+def import_records_pipelined(conn, records, form_fields, ethnicity_mappings, customer_index,
+                             batch_size=0, total_rows='?', queue_depth=4, checkpoint=None, seen_events=None):
+    """Overlap row parsing/building with database writes.
+
+    The calling thread builds payloads (using conn only for customer lookups)
+    and hands them over in batches through a queue of at most queue_depth
+    batches, so it blocks when the writer falls behind. A writer thread flushes
+    each batch with write_event_batch on its own connection and reports
+    throughput and queue depth every PIPELINE_REPORT_SECONDS. If the writer
+    fails, building stops; if building fails, queued batches are still written
+    before the error propagates. The writer adds committed rows to checkpoint
+    and tallies duplicates against seen_events, as import_records does.
+    Returns (success_count, error_count, errors, duplicate_count).
+    """
+    batch_size = batch_size or PIPELINE_BATCH_SIZE
+    batches = queue.Queue(maxsize=queue_depth)
+    writer_failed = threading.Event()
+    written = {'imported': 0, 'duplicates': 0, 'errors': [], 'failure': None}
+    seen_events = {} if seen_events is None else seen_events
+    
+    writer_conn = psycopg2.connect(**DB_CONFIG)
+    writer_conn.autocommit = False
+    
+    def write_batches():
+        started = last_report = perf_counter()
+        try:
+            while True:
+                batch = batches.get()
+                if batch is None:
+                    break
+                committed, batch_errors = write_event_batch(writer_conn, batch)
+                record_checkpoint(checkpoint, committed)
+                imported, duplicates = tally_committed(batch, committed, seen_events)
+                written['imported'] += imported
+                written['duplicates'] += duplicates
+                written['errors'].extend(batch_errors)
+                
+                now = perf_counter()
+                if now - last_report >= PIPELINE_REPORT_SECONDS:
+                    last_report = now
+                    logger.info("🚰 Pipeline: %s events written (%.1f rows/second), queue depth %s/%s",
+                                written['imported'], written['imported'] / (now - started),
+                                batches.qsize(), queue_depth)
+        except Exception as e:
+            written['failure'] = e
+            writer_failed.set()
+            logger.exception("💥 Writer stage failed: %s", e)
+    
+    def hand_off(batch):
+        # Blocks while the queue is full (backpressure) unless the writer has died;
+        # batch None is the end-of-input sentinel
+        while not writer_failed.is_set():
+            try:
+                batches.put(batch, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    logger.info(f"🚰 Pipeline mode: batches of {batch_size} events, queue depth {queue_depth}")
+    writer = threading.Thread(target=write_batches, name='import-writer', daemon=True)
+    writer.start()
+    
+    built_count = 0
+    error_count = 0
+    errors = []
+    batch = []
+    resumed = checkpoint is not None and checkpoint['resumed']
+    log_rows = logger.isEnabledFor(logging.INFO)
+    
+    try:
+        for row in records:
+            row_number = row['row_number']
+            try:
+                if log_rows:
+                    logger.info("📝 Processing row %s/%s", row_number, total_rows)
+                
+                with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                    payload = build_event_payload(
+                        row, cursor, form_fields, ethnicity_mappings, customer_index
+                    )
+                if payload is None:
+                    error_count += 1
+                    errors.append(f"Row {row_number}: No valid start date for event '{row['texts']['ma_title']}'")
+                    continue
+                
+                batch.append(payload)
+                built_count += 1
+                
             except Exception as e:
                 conn.rollback()
-                error_msg = f"Row {index + 1}: {str(e)}"
-                logger.error(f"❌ Error importing: {error_msg}")
-                logger.error(traceback.format_exc())
+                error_msg = f"Row {row_number}: {str(e)}"
+                logger.exception("❌ Error importing: %s", error_msg)
                 errors.append(error_msg)
                 error_count += 1
                 
                 # Stop after 5 consecutive errors to avoid flooding
-                if error_count >= 5 and success_count == 0:
+                if error_count >= 5 and built_count == 0 and not resumed:
                     logger.error("💥 Too many consecutive errors - stopping import")
                     break
                 continue
+            
+            if len(batch) >= batch_size:
+                if not hand_off(batch):
+                    break
+                batch = []
+        
+        if batch:
+            hand_off(batch)
+    finally:
+        # Same timed put as batches, so a writer dying now cannot leave this blocked
+        hand_off(None)
+        writer.join()
+        writer_conn.close()
+        conn.rollback()
+    
+    if written['failure'] is not None:
+        error_count += 1
+        errors.append(f"Import stopped: writer failed: {written['failure']}")
+    
+    return (written['imported'], error_count + len(written['errors']), errors + written['errors'],
+            written['duplicates'])
+
+def count_csv_rows(csv_path):
+    """Number of data rows in the CSV (quoted multi-line cells count once)."""
+    return sum(
+        len(chunk) for chunk in pd.read_csv(csv_path, usecols=[REQUIRED_CSV_COLUMNS[0]],
+                                            dtype=str, chunksize=100_000)
+    )
+
+# Row numbers committed so far, so an interrupted import can resume. --workers
+# processes each write a '<file>.part<first row>' sidecar that is merged back in.
+CHECKPOINT_FILE = 'all_days_import.checkpoint.json'
+
+def csv_fingerprint(csv_path):
+    """Identify the CSV a checkpoint belongs to (name, size and mtime)."""
+    stat = os.stat(csv_path)
+    return f"{os.path.basename(csv_path)}:{stat.st_size}:{int(stat.st_mtime)}"
+
+def _merge_intervals(intervals):
+    merged = []
+    for first, last in sorted(intervals):
+        if merged and first <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], last)
+        else:
+            merged.append([first, last])
+    return merged
+
+def _checkpoint_paths(checkpoint_file):
+    sidecars = glob.glob(f"{glob.escape(checkpoint_file)}.part*")
+    return [checkpoint_file] + sorted(path for path in sidecars if not path.endswith('.tmp'))
+
+def open_checkpoint(checkpoint_file, csv_path, restart=False):
+    """Load the checkpoint of this tenant and CSV (plus any worker sidecars).
+
+    Returns {'file', 'csv', 'committed', 'resumed'} where committed is a merged
+    list of [first_row, last_row] intervals and resumed the number of rows in it. Checkpoints of another tenant or another
+    version of the CSV are ignored; restart=True deletes them and starts over.
+    """
+    fingerprint = csv_fingerprint(csv_path)
+    intervals = []
+    
+    for path in _checkpoint_paths(checkpoint_file):
+        if restart:
+            if os.path.exists(path):
+                os.remove(path)
+            continue
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            continue
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️  Ignoring unreadable checkpoint {path}: {e}")
+            continue
+        if data.get('tenant_id') != TENANT_ID or data.get('csv') != fingerprint:
+            logger.info(f"🔖 Ignoring checkpoint {path} from a different tenant or CSV")
+            continue
+        intervals.extend(data['committed'])
+    
+    committed = _merge_intervals(intervals)
+    checkpoint = {'file': checkpoint_file, 'csv': fingerprint, 'committed': committed,
+                  'resumed': checkpoint_rows(committed)}
+    if checkpoint['resumed']:
+        logger.info(f"🔖 Resuming: {checkpoint['resumed']} rows already committed according to {checkpoint_file}")
+    return checkpoint
+
+def checkpoint_rows(committed):
+    """Number of rows covered by a list of committed intervals."""
+    return sum(last - first + 1 for first, last in committed)
+
+def record_checkpoint(checkpoint, row_numbers):
+    """Add committed row numbers to the checkpoint and rewrite its file."""
+    if checkpoint is None or not row_numbers:
+        return
+    checkpoint['committed'] = _merge_intervals(
+        checkpoint['committed'] + [[row_number, row_number] for row_number in row_numbers]
+    )
+    _write_checkpoint(checkpoint)
+
+def _write_checkpoint(checkpoint):
+    try:
+        temp_file = f"{checkpoint['file']}.tmp"
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump({'tenant_id': TENANT_ID, 'csv': checkpoint['csv'],
+                       'committed': checkpoint['committed']}, f)
+        os.replace(temp_file, checkpoint['file'])
+    except OSError as e:
+        logger.warning(f"⚠️  Could not write checkpoint {checkpoint['file']}: {e}")
+
+def consolidate_checkpoint(checkpoint):
+    """Fold worker sidecar checkpoints into the main checkpoint file."""
+    merged = open_checkpoint(checkpoint['file'], CSV_FILE)
+    _write_checkpoint(merged)
+    for path in _checkpoint_paths(checkpoint['file'])[1:]:
+        os.remove(path)
+    return merged
+
+def skip_committed_rows(records, committed):
+    """Yield the records whose row_number is not in a committed interval."""
+    starts = [first for first, _ in committed]
+    skipped = 0
+    for record in records:
+        position = bisect_right(starts, record['row_number']) - 1
+        if position >= 0 and record['row_number'] <= committed[position][1]:
+            skipped += 1
+            continue
+        yield record
+    if skipped:
+        logger.info(f"⏭️  Skipped {skipped} rows already committed by a previous run")
+
+# Per-process state of --workers import processes, set by _init_import_worker
+_WORKER_CONTEXT = {}
+
+def _init_import_worker(log_queue, log_level, context):
+    """Pool initializer: route logging to the parent and keep the shared context."""
+    root = logging.getLogger()
+    root.handlers[:] = [QueueHandler(log_queue)]
+    root.setLevel(log_level)
+    _WORKER_CONTEXT.update(context)
+
+def _import_row_range(row_range):
+    """Import CSV rows [start, stop) on the worker's own connection.
+
+    Returns (success_count, error_count, errors, duplicate_count, event ids
+    committed as {event id: first row number}, datetime format hits, datetime
+    cache hits, datetime cache misses); the datetime counts cover this range
+    only, as a pool process runs several ranges.
+    """
+    start, stop = row_range
+    context = _WORKER_CONTEXT
+    format_hits_before = Counter(DATETIME_FORMAT_HITS)
+    cache_hits_before, cache_misses_before = PARSE_DATETIME_CACHE.hits, PARSE_DATETIME_CACHE.misses
+    seen_events = {}
+    logger.info(f"👷 Worker {os.getpid()} importing rows {start + 1}-{stop}")
+    
+    try:
+        conn = psycopg2.connect(**DB_CONFIG)
+        conn.autocommit = False
+        try:
+            form_totals = compile_form_totals(context['form_fields'])
+            read_options = {**context['read_options'], 'skiprows': range(1, start + 1), 'nrows': stop - start}
+            records = iter_import_records(CSV_FILE, context['chunk_size'], read_options, form_totals,
+                                          row_offset=start)
+            checkpoint = context['checkpoint']
+            if checkpoint:
+                records = skip_committed_rows(records, checkpoint['committed'])
+                checkpoint = {**checkpoint, 'file': f"{checkpoint['file']}.part{start + 1}", 'committed': []}
+            import_args = (
+                conn, records, context['form_fields'],
+                context['ethnicity_mappings'], context['customer_index'],
+                context['batch_size'], context['total_rows']
+            )
+            if context['pipeline_depth']:
+                result = import_records_pipelined(*import_args, context['pipeline_depth'], checkpoint=checkpoint,
+                                                  seen_events=seen_events)
+            else:
+                result = import_records(*import_args, commit_interval=context['commit_interval'],
+                                        checkpoint=checkpoint, seen_events=seen_events)
+        finally:
+            conn.close()
+    except Exception as e:
+        logger.exception("❌ Worker for rows %s-%s failed: %s", start + 1, stop, e)
+        result = (0, 1, [f"Rows {start + 1}-{stop}: worker failed: {e}"], 0)
+    
+    return result + (seen_events, dict(DATETIME_FORMAT_HITS - format_hits_before),
+                     PARSE_DATETIME_CACHE.hits - cache_hits_before,
+                     PARSE_DATETIME_CACHE.misses - cache_misses_before)
+
+def import_in_workers(workers, total_rows, context):
+    """Split the CSV into disjoint row ranges and import them in worker processes.
+
+    Each worker reads only its own range and opens its own connection; context
+    carries the bootstrap lookups (built once here) plus read/batch options.
+    Counts, error lists and datetime stats are merged back in row order (a row
+    merged into an event imported by an earlier range counts as a duplicate),
+    and the workers' checkpoint sidecars into the main checkpoint.
+    """
+    bounds = [total_rows * i // workers for i in range(workers + 1)]
+    row_ranges = [(start, stop) for start, stop in zip(bounds, bounds[1:]) if stop > start]
+    logger.info(f"👷 Importing {total_rows} rows across {len(row_ranges)} worker processes")
+    
+    log_queue = multiprocessing.Queue()
+    log_forwarder = QueueListener(log_queue, *logging.getLogger().handlers)
+    log_forwarder.start()
+    try:
+        with multiprocessing.Pool(
+            len(row_ranges), initializer=_init_import_worker,
+            initargs=(log_queue, logging.getLogger().level, {**context, 'total_rows': total_rows})
+        ) as pool:
+            results = pool.map(_import_row_range, row_ranges)
+    finally:
+        log_forwarder.stop()
+        if context['checkpoint']:
+            context['checkpoint'].update(consolidate_checkpoint(context['checkpoint']))
+    
+    success_count = 0
+    duplicate_count = 0
+    error_count = 0
+    errors = []
+    seen_events = {}
+    for imported, failed, worker_errors, duplicates, worker_events, format_hits, cache_hits, cache_misses in results:
+        merged = [event_id for event_id in worker_events if event_id in seen_events]
+        for event_id in merged:
+            logger.warning(f"⚠️  Row {worker_events[event_id]}: identical to row {seen_events[event_id]} "
+                           f"- merged into one event")
+        success_count += imported - len(merged)
+        duplicate_count += duplicates + len(merged)
+        error_count += failed
+        errors.extend(worker_errors)
+        seen_events = {**worker_events, **seen_events}
+        DATETIME_FORMAT_HITS.update(format_hits)
+        PARSE_DATETIME_CACHE.merge_counts(cache_hits, cache_misses)
+    return success_count, error_count, errors, duplicate_count
+
+def import_all_days_events(batch_size=0, chunk_size=0, customers_may_be_stale=False,
+                           use_reference_cache=True, workers=1, pipeline_depth=0, commit_interval=0,
+                           checkpoint_file=CHECKPOINT_FILE, restart=False):
+    """Main import function with schema compliance (options: see the command-line help)."""
+    logger.info("🚀 Starting CORRECTED All Days import process...")
+    
+    try:
+        # Load CSV file
+        read_options = resolve_csv_schema(CSV_FILE)
+        if workers > 1:
+            total_rows = count_csv_rows(CSV_FILE)
+            logger.info(f"📊 Counted {total_rows} records in CSV")
+        elif chunk_size:
+            logger.info(f"📂 Streaming CSV file in chunks of {chunk_size} rows...")
+            total_rows = '?'
+        else:
+            logger.info("📂 Loading CSV file...")
+            df = pd.read_csv(CSV_FILE, **read_options)
+            total_rows = len(df)
+            logger.info(f"📊 Loaded {total_rows} records from CSV")
+        
+        # Connect to database
+        logger.info("🔌 Connecting to database...")
+        conn = psycopg2.connect(**DB_CONFIG)
+        conn.autocommit = False
+        
+        with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+            # Validate schema and load mappings in one round trip
+            bootstrap = bootstrap_import(
+                cursor, customers_may_be_stale,
+                REFERENCE_CACHE_FILE if use_reference_cache else None
+            )
+            form_fields = resolve_form_fields(bootstrap['field_mappings'])
+            form_totals = compile_form_totals(form_fields)
+            ethnicity_mappings = bootstrap['ethnicity_mappings']
+            customer_index = bootstrap['customer_index']
+        
+        checkpoint = open_checkpoint(checkpoint_file, CSV_FILE, restart) if checkpoint_file else None
+        
+        if batch_size:
+            logger.info(f"📦 Bulk write mode: flushing every {batch_size} events")
+        logger.info("📝 Starting corrected import process...")
+        import_started = perf_counter()
+        
+        if workers > 1:
+            # Workers open their own connections; don't carry this one into them
+            conn.close()
+            success_count, error_count, errors, duplicate_count = import_in_workers(workers, total_rows, {
+                'form_fields': form_fields,
+                'ethnicity_mappings': ethnicity_mappings,
+                'customer_index': customer_index,
+                'read_options': read_options,
+                'chunk_size': chunk_size,
+                'batch_size': batch_size,
+                'pipeline_depth': pipeline_depth,
+                'commit_interval': commit_interval,
+                'checkpoint': checkpoint
+            })
+        else:
+            if chunk_size:
+                records = iter_import_records(CSV_FILE, chunk_size, read_options, form_totals)
+            else:
+                records = prepare_import_records(df, form_totals)
+            if checkpoint:
+                records = skip_committed_rows(records, checkpoint['committed'])
+            import_args = (conn, records, form_fields, ethnicity_mappings, customer_index,
+                           batch_size, total_rows)
+            if pipeline_depth:
+                success_count, error_count, errors, duplicate_count = import_records_pipelined(
+                    *import_args, pipeline_depth, checkpoint=checkpoint
+                )
+            else:
+                success_count, error_count, errors, duplicate_count = import_records(
+                    *import_args, commit_interval=commit_interval, checkpoint=checkpoint
+                )
+        
+        elapsed = perf_counter() - import_started
+        rows_per_second = success_count / elapsed if elapsed > 0 else 0.0
+        peak_mb = peak_memory_mb()
         
         # Summary
         logger.info("=" * 80)
         logger.info("📊 CORRECTED IMPORT SUMMARY")
         logger.info("=" * 80)
         logger.info(f"✅ Successfully imported: {success_count} events")
+        logger.info(f"🔁 Duplicate rows: {duplicate_count} (identical to an earlier row, merged into its event)")
         logger.info(f"❌ Failed imports: {error_count} events")
+        logger.info(f"🥾 Bootstrap: {bootstrap['seconds']:.2f}s (schema, mappings and customers in 1 query, "
+                    f"reference cache {bootstrap['reference_cache']})")
+        logger.info(f"⚡ Throughput: {rows_per_second:.1f} rows/second ({elapsed:.1f}s, batch size {batch_size or 1}, "
+                    f"{workers} worker{'s' if workers > 1 else ''})")
+        logger.info(f"🧠 Peak memory: {f'{peak_mb:.1f} MB' if peak_mb is not None else 'n/a'}")
+        if checkpoint:
+            logger.info(f"🔖 Checkpoint: {checkpoint_rows(checkpoint['committed'])} rows committed "
+                        f"({checkpoint['file']})")
+        log_datetime_format_hits()
+        logger.info(f"🗂️  Datetime parse cache: {PARSE_DATETIME_CACHE.summary()}")
         logger.info("=" * 80)
         
         if errors:
@@ -701,8 +2116,34 @@ def import_all_days_events():
             conn.close()
 
 if __name__ == "__main__":
-    import os
-    if not os.path.exists('ma_alldaies.csv'):
+    parser = argparse.ArgumentParser(description="Import the PowerApps All Days export (ma_alldaies.csv)")
+    parser.add_argument('--batch-size', type=int, default=0,
+                        help="flush N events per multi-row INSERT (default: 0, one transaction per row)")
+    parser.add_argument('--chunk-size', type=int, default=0,
+                        help="stream the CSV N rows at a time (default: 0, load the whole file)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="import disjoint row ranges in N parallel processes (default: 1)")
+    parser.add_argument('--commit-interval', type=int, default=0,
+                        help="without --batch-size, commit every N rows and isolate rows with savepoints "
+                             "(default: 0, one transaction per row)")
+    parser.add_argument('--pipeline-depth', type=int, default=0,
+                        help="build rows and write batches on separate threads with a queue of N batches "
+                             "(default: 0, sequential)")
+    parser.add_argument('--restart', action='store_true',
+                        help=f"discard {CHECKPOINT_FILE} and process every row again")
+    parser.add_argument('--no-checkpoint', action='store_true',
+                        help="do not record or skip committed rows")
+    parser.add_argument('--customers-may-be-stale', action='store_true',
+                        help="re-check the database when a customer is not in the preloaded index")
+    parser.add_argument('--no-reference-cache', action='store_true',
+                        help=f"always fetch form fields and ethnicity options instead of reusing {REFERENCE_CACHE_FILE}")
+    parser.add_argument('--log-level', default='DEBUG',
+                        choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                        help="log verbosity; per-row messages are INFO/DEBUG (default: DEBUG)")
+    args = parser.parse_args()
+    configure_logging(getattr(logging, args.log_level))
+    
+    if not os.path.exists(CSV_FILE):
         print("❌ Error: ma_alldaies.csv file not found!")
         sys.exit(1)
     
@@ -721,7 +2162,17 @@ if __name__ == "__main__":
         sys.exit(0)
     
     print("\n🚀 Starting corrected import...")
-    success, errors, error_list = import_all_days_events()
+    success, errors, error_list = import_all_days_events(
+        batch_size=args.batch_size,
+        chunk_size=args.chunk_size,
+        customers_may_be_stale=args.customers_may_be_stale,
+        use_reference_cache=not args.no_reference_cache,
+        workers=args.workers,
+        pipeline_depth=args.pipeline_depth,
+        commit_interval=args.commit_interval,
+        checkpoint_file=None if args.no_checkpoint else CHECKPOINT_FILE,
+        restart=args.restart
+    )
     
     print("\n" + "=" * 50)
     if success > 0:
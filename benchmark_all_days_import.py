@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the All Days import hot paths on synthetic PowerApps data.
+Run from the repository root: python benchmark_all_days_import.py [--rows N]
+"""
+
+import argparse
+import gc
+import logging
+import random
+from decimal import Decimal
+from time import perf_counter
+
+import pandas as pd
+
+import All_Days_Import_Script_Perfect as importer
+
+# Value shapes seen in ma_alldaies.csv exports, weighted towards the PowerApps default
+DATETIME_SHAPES = [
+    ('{m}/{d}/{y}  {h12}:{mi:02d}:00 {ampm}', 6),
+    ('{m}/{d}/{y} {h12}:{mi:02d} {ampm}', 2),
+    ('{y}-{m:02d}-{d:02d} {h:02d}:{mi:02d}:00', 1),
+    ('{y}-{m:02d}-{d:02d} {h:02d}:{mi:02d}:00.0000000', 1),
+    ('{d}/{m}/{y}', 1),
+]
+
+def synthetic_datetimes(rows, seed=42):
+    """Build a column of PowerApps-style datetime strings (with some blanks)."""
+    rng = random.Random(seed)
+    shapes, weights = zip(*DATETIME_SHAPES)
+    values = []
+    for _ in range(rows):
+        if rng.random() < 0.02:
+            values.append(None)
+            continue
+        h = rng.choice([10, 11, 12, 13, 16, 18])
+        values.append(rng.choices(shapes, weights)[0].format(
+            y=rng.choice([2024, 2025, 2026]), m=rng.randint(1, 12), d=rng.randint(1, 28),
+            h=h, h12=h % 12 or 12, mi=rng.choice([0, 30]), ampm='AM' if h < 12 else 'PM'
+        ))
+    return pd.Series(values, dtype=str)
+
+def reset_datetime_stats():
+    importer.LEARNED_DATETIME_FORMATS.clear()
+    importer.DATETIME_FORMAT_HITS.clear()
+
+def timed(label, func):
+    # Results are kept for comparison; like timeit, keep the collector from
+    # rescanning them so the timing reflects the code under test
+    gc.disable()
+    try:
+        started = perf_counter()
+        result = func()
+        elapsed = perf_counter() - started
+    finally:
+        gc.enable()
+    print(f"  {label:<28} {elapsed:8.3f}s")
+    return result, elapsed
+
+def benchmark_datetime_parsing(rows):
+    print(f"Datetime parsing, {rows} rows:")
+    series = synthetic_datetimes(rows)
+    
+    reset_datetime_stats()
+    per_cell, per_cell_time = timed(
+        "per-cell parse_powerapp_datetime",
+        lambda: [importer.parse_powerapp_datetime(value, 'ma_nikahstartdatetime') for value in series]
+    )
+    reset_datetime_stats()
+    column, column_time = timed(
+        "parse_datetime_column",
+        lambda: importer.parse_datetime_column(series, 'ma_nikahstartdatetime')
+    )
+    
+    assert per_cell == column, "column parser disagrees with per-cell parser"
+    print(f"  speed-up: {per_cell_time / column_time:.1f}x (results identical)")
+
+def synthetic_price(rng):
+    """A PowerApps price cell: mostly whole pence, occasionally blank or sub-penny."""
+    roll = rng.random()
+    if roll < 0.05:
+        return None
+    if roll < 0.06:
+        return rng.choice(['12.345', '0.005'])
+    return rng.choice(['0', '50', '125.50', '300', f"{rng.randint(0, 99999) / 100:.2f}"])
+
+def synthetic_form_frame(rows, seed=42):
+    """Build a frame with every PowerApps form column populated."""
+    rng = random.Random(seed)
+    columns = {}
+    for column in importer.FORM_FLAG_COLUMNS:
+        if column in importer.FORM_PRICE_COLUMNS:
+            # Reception extras whose own column holds the price
+            columns[column] = [synthetic_price(rng) for _ in range(rows)]
+        elif column in importer.FORM_YESNO_COLUMNS:
+            columns[column] = [rng.choice(['Yes', 'No', 'No', None]) for _ in range(rows)]
+        else:
+            columns[column] = [rng.choice(['', 'Gold', 'Ivory', 'Round tables', None]) for _ in range(rows)]
+    for column in importer.FORM_PRICE_COLUMNS:
+        if column not in columns:
+            columns[column] = [synthetic_price(rng) for _ in range(rows)]
+    return pd.DataFrame(columns, dtype=str)
+
+def synthetic_field_mappings():
+    """Field mappings covering every our_field in POWERAPP_*_MAPPINGS."""
+    field_mappings = {}
+    for mappings in (importer.POWERAPP_NIKKAH_MAPPINGS, importer.POWERAPP_RECEPTION_MAPPINGS):
+        for our_field, price_field in mappings.values():
+            if price_field:
+                field_type = 'fixed_price_notes_toggle'
+            elif our_field == 'notes_section':
+                field_type = 'text_notes_only'
+            else:
+                field_type = 'dropdown_options'
+            field_mappings[our_field] = {
+                'id': f'field-{our_field}', 'name': our_field, 'field_type': field_type,
+                'has_pricing': bool(price_field), 'unit_price': 0
+            }
+    return field_mappings
+
+def mapped_form_responses(record, form_type, field_mappings):
+    """The per-row builder before resolve_form_fields: walks the mappings for every record."""
+    powerapp_mappings = (importer.POWERAPP_NIKKAH_MAPPINGS if form_type == 'nikkah'
+                         else importer.POWERAPP_RECEPTION_MAPPINGS)
+    form_responses = {}
+    form_total = Decimal('0.00')
+    for powerapp_field, (our_field, price_field) in powerapp_mappings.items():
+        if our_field not in field_mappings:
+            continue
+        field_info = field_mappings[our_field]
+        field_type = field_info['field_type']
+        field_response = {'enabled': False, 'price': 0, 'quantity': 1, 'notes': '', 'selections': []}
+        if field_type == 'fixed_price_notes_toggle' and field_info['has_pricing']:
+            enabled = record['flags'][powerapp_field]
+            price = record['prices'][price_field] if price_field else Decimal('0')
+            field_response['enabled'] = enabled
+            field_response['price'] = float(price)
+            if enabled and price > 0:
+                form_total += price
+        elif field_type == 'dropdown_options':
+            selection = record['texts'][powerapp_field]
+            field_response['enabled'] = bool(selection)
+            field_response['selections'] = [selection] if selection else []
+            field_response['notes'] = selection
+        elif field_type == 'text_notes_only':
+            text_value = record['texts'][powerapp_field]
+            field_response['enabled'] = bool(text_value)
+            field_response['notes'] = text_value
+        form_responses[field_info['id']] = field_response
+    return form_responses, form_total
+
+def benchmark_form_responses(rows):
+    print(f"Form responses (Nikkah + Reception), {rows} rows:")
+    records = list(importer.prepare_import_records(synthetic_form_frame(rows)))
+    field_mappings = synthetic_field_mappings()
+    
+    mapped, mapped_time = timed(
+        "mappings walked per row",
+        lambda: [(mapped_form_responses(record, 'nikkah', field_mappings),
+                  mapped_form_responses(record, 'reception', field_mappings))
+                 for record in records]
+    )
+    
+    def run_resolved():
+        form_fields = importer.resolve_form_fields(field_mappings)
+        return [(importer.create_form_responses_corrected(record, 'nikkah', form_fields),
+                 importer.create_form_responses_corrected(record, 'reception', form_fields))
+                for record in records]
+    resolved, resolved_time = timed("fields resolved once", run_resolved)
+    
+    assert mapped == resolved, "resolved form fields disagree with walking the mappings"
+    print(f"  speed-up: {mapped_time / resolved_time:.1f}x (results identical)")
+
+def benchmark_form_totals(rows):
+    print(f"Form totals (Nikkah + Reception), {rows} rows:")
+    df = synthetic_form_frame(rows)
+    records = list(importer.prepare_import_records(df))
+    form_fields = importer.resolve_form_fields(synthetic_field_mappings())
+    form_totals = importer.compile_form_totals(form_fields)
+    
+    def decimal_total(record, priced_toggles):
+        total = Decimal('0.00')
+        for flag_column, price_column in priced_toggles:
+            price = record['prices'][price_column]
+            if record['flags'][flag_column] and price > 0:
+                total += price
+        return total
+    
+    per_row, per_row_time = timed(
+        "per-row Decimal sums",
+        lambda: [(decimal_total(record, form_totals['nikkah']), decimal_total(record, form_totals['reception']))
+                 for record in records]
+    )
+    
+    price_columns = list(dict.fromkeys(importer.CORE_PRICE_COLUMNS + importer.FORM_PRICE_COLUMNS))
+    priced = {column: importer.price_column(df, column) for column in price_columns}
+    flags = {column: importer.bool_column(df, column) for column in importer.FORM_FLAG_COLUMNS}
+    columns, column_time = timed(
+        "column-wise pence",
+        lambda: importer.form_total_columns(priced, flags, form_totals, len(df))
+    )
+    
+    exact = sum(total is not None for total in columns['nikkah'] + columns['reception'])
+    for record, (nikkah, reception) in zip(records, per_row):
+        assert importer.create_form_responses_corrected(record, 'nikkah', form_fields)[1] == nikkah
+        assert importer.create_form_responses_corrected(record, 'reception', form_fields)[1] == reception
+        record['form_totals'] = {'nikkah': columns['nikkah'][record['row_number'] - 1],
+                                 'reception': columns['reception'][record['row_number'] - 1]}
+        assert importer.create_form_responses_corrected(record, 'nikkah', form_fields)[1] == nikkah
+        assert importer.create_form_responses_corrected(record, 'reception', form_fields)[1] == reception
+    print(f"  speed-up: {per_row_time / column_time:.1f}x "
+          f"(identical to the penny; {2 * rows - exact} sub-penny totals left to Decimal)")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100_000)
+    args = parser.parse_args()
+    
+    # Measure parsing and building, not log formatting
+    importer.logger.setLevel(logging.WARNING)
+    
+    benchmark_datetime_parsing(args.rows)
+    benchmark_form_responses(args.rows)
+    benchmark_form_totals(args.rows)
+
+if __name__ == "__main__":
+    main()
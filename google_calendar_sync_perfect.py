@@ -7,9 +7,14 @@ Handles Nikkah, Reception, and All Day event types
 
 import os
 import json
+import hashlib
+import math
+import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, date, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any
 import logging
 
 # Google Calendar API
@@ -30,8 +35,111 @@ SUPABASE_KEY = "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.eyJpc3MiOiJzdXBhYmFzZSIsInJ
 # Your tenant ID - update this
 TENANT_ID = "your-tenant-id-here"  # Replace with actual tenant ID
 
-# Rate limiting
-REQUEST_DELAY = 1.2  # seconds between API calls
+# Rate limiting - Calendar API quota per user (see Google Cloud console > APIs > Quotas)
+REQUESTS_PER_MINUTE = 600
+MIN_REQUESTS_PER_MINUTE = 30  # floor the limiter slows to while Google keeps rejecting
+MAX_RETRIES = 5  # retries of a rate-limited request
+BACKOFF_BASE = 1.0  # seconds, doubled per retry (with full jitter)
+BACKOFF_MAX = 32.0
+
+# Inserts/deletes sent per batch HTTP request (Calendar API recommends at most 50)
+BATCH_SIZE = 50
+
+# Threads syncing event chunks in parallel (all share the rate limiter)
+SYNC_WORKERS = 4
+
+# Change feed state: the calendar's nextSyncToken and a local mirror of its events
+CALENDAR_STATE_FILE = 'calendar_sync_state.json'
+MIRRORED_FIELDS = ('id', 'summary', 'status', 'start', 'end', 'extendedProperties')
+
+# Private extended properties stamped on every Google event this script creates
+SYNC_PROPERTY_TENANT = 'eventisTenantId'
+SYNC_PROPERTY_EVENT = 'eventisEventId'
+SYNC_PROPERTY_HASH = 'eventisContentHash'
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """True for HttpError 429 or 403 rateLimitExceeded/userRateLimitExceeded"""
+    if not isinstance(error, HttpError):
+        return False
+    if error.resp.status == 429:
+        return True
+    if error.resp.status != 403:
+        return False
+    details = error.error_details if isinstance(error.error_details, list) else []
+    reasons = {detail.get('reason') for detail in details if isinstance(detail, dict)}
+    return bool(reasons & {'rateLimitExceeded', 'userRateLimitExceeded'}) or 'Rate Limit Exceeded' in str(error)
+
+def is_retryable_error(error: Exception) -> bool:
+    """True for rate-limit errors and HttpError 5xx, which may succeed if sent again"""
+    return is_rate_limit_error(error) or (isinstance(error, HttpError) and error.resp.status >= 500)
+
+class RateLimiter:
+    """Token bucket shared by every Google API call of a GoogleCalendarSync
+    
+    Tokens refill at the current rate up to capacity; a request costs one token
+    per API call it contains (a batch of 50 costs 50) and waits while the bucket
+    is in debt. The rate halves each time
+    Google answers with a rate-limit error and creeps back up to the quota on
+    success. Safe to use from several threads.
+    """
+    
+    def __init__(self, requests_per_minute: float = REQUESTS_PER_MINUTE,
+                 capacity: int = BATCH_SIZE):
+        self.max_rate = requests_per_minute / 60
+        self.min_rate = min(MIN_REQUESTS_PER_MINUTE / 60, self.max_rate)
+        self.rate = self.max_rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+        self.waited = 0.0
+        self.rate_limited = 0
+    
+    def acquire(self, tokens: int = 1):
+        """Take tokens, sleeping until the bucket has refilled enough to cover them
+        
+        Tokens are reserved immediately (the bucket may go negative), so callers
+        on other threads queue up behind this one instead of racing for refills.
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= tokens
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            self.waited += wait
+        if wait:
+            time.sleep(wait)
+    
+    def backoff(self, attempt: int):
+        """Slow the bucket down and sleep with exponential backoff and full jitter"""
+        with self.lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.rate_limited += 1
+        time.sleep(random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt)))
+    
+    def succeeded(self, tokens: int = 1):
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * tokens / 100)
+    
+    def execute(self, request, tokens: int = 1):
+        """Execute a googleapiclient request under the limit, retrying rate-limit errors"""
+        for attempt in range(MAX_RETRIES + 1):
+            self.acquire(tokens)
+            try:
+                response = request.execute()
+            except HttpError as e:
+                if not is_rate_limit_error(e) or attempt == MAX_RETRIES:
+                    raise
+                logging.warning(f"Rate limited by Google (attempt {attempt + 1}/{MAX_RETRIES}), backing off")
+                self.backoff(attempt)
+                continue
+            self.succeeded(tokens)
+            return response
+    
+    def summary(self) -> str:
+        return (f"{self.rate_limited} rate-limit responses, {self.waited:.1f}s throttled, "
+                f"current rate {self.rate * 60:.0f}/{self.max_rate * 60:.0f} requests/minute")
 
 # Logging setup
 logging.basicConfig(
@@ -43,11 +151,32 @@ logging.basicConfig(
     ]
 )
 
+def content_hash(calendar_event: Dict) -> str:
+    """Stable hash of the rendered calendar content (summary, description, start/end)"""
+    content = {key: calendar_event.get(key) for key in ('summary', 'description', 'start', 'end')}
+    return hashlib.sha256(json.dumps(content, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+def private_properties(google_event: Dict) -> Dict[str, str]:
+    return google_event.get('extendedProperties', {}).get('private', {})
+
+def event_start_date(google_event: Dict) -> str:
+    """YYYY-MM-DD the Google event starts on (all-day or timed)"""
+    start = google_event.get('start', {})
+    return (start.get('date') or start.get('dateTime') or '')[:10]
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
 class GoogleCalendarSync:
     def __init__(self):
         self.supabase: Client = None
         self.calendar_service = None
+        self.credentials = None
+        self._thread_local = threading.local()
         self.calendar_id = None
+        self.rate_limiter = RateLimiter()
         self.field_mappings = self._get_field_mappings()
         
     def _get_field_mappings(self) -> Dict[str, str]:
@@ -93,9 +222,26 @@ class GoogleCalendarSync:
             with open(token_file, 'w') as token:
                 token.write(creds.to_json())
         
-        self.calendar_service = build('calendar', 'v3', credentials=creds)
+        self.credentials = creds
+        self.calendar_service = self.build_calendar_service()
         logging.info("Google Calendar API authenticated successfully")
     
+    def build_calendar_service(self):
+        """Build a Calendar API client from the authenticated credentials"""
+        return build('calendar', 'v3', credentials=self.credentials)
+    
+    def service(self):
+        """Calendar API client for the calling thread
+        
+        googleapiclient clients are not thread-safe, so sync worker threads each
+        build their own; the main thread uses calendar_service.
+        """
+        if threading.current_thread() is threading.main_thread():
+            return self.calendar_service
+        if getattr(self._thread_local, 'calendar_service', None) is None:
+            self._thread_local.calendar_service = self.build_calendar_service()
+        return self._thread_local.calendar_service
+    
     def setup_supabase(self):
         """Setup Supabase client"""
         self.supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
@@ -119,6 +265,90 @@ class GoogleCalendarSync:
             logging.error(f"Error fetching calendar integration: {e}")
             return None
     
+    def _list_event_pages(self, **params) -> tuple:
+        """Run events().list over every page; returns (items, nextSyncToken)"""
+        items = []
+        page_token = None
+        
+        while True:
+            events_result = self.rate_limiter.execute(self.service().events().list(
+                calendarId=self.calendar_id,
+                singleEvents=True,
+                maxResults=2500,
+                pageToken=page_token,
+                **params
+            ))
+            items.extend(events_result.get('items', []))
+            page_token = events_result.get('nextPageToken')
+            if not page_token:
+                return items, events_result.get('nextSyncToken')
+    
+    def _load_calendar_state(self) -> Dict:
+        try:
+            with open(CALENDAR_STATE_FILE, encoding='utf-8') as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logging.warning(f"Ignoring unreadable calendar state {CALENDAR_STATE_FILE}: {e}")
+            return {}
+        return state if state.get('calendar_id') == self.calendar_id else {}
+    
+    def _save_calendar_state(self, state: Dict):
+        try:
+            temp_file = f"{CALENDAR_STATE_FILE}.tmp"
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+            os.replace(temp_file, CALENDAR_STATE_FILE)
+        except OSError as e:
+            logging.warning(f"Could not write calendar state {CALENDAR_STATE_FILE}: {e}")
+    
+    def fetch_calendar_changes(self) -> Dict[str, Dict]:
+        """Bring the local mirror of the calendar up to date and return it (event ID -> event)
+        
+        The nextSyncToken saved by the previous run means only events changed or
+        deleted since then are fetched. The first run, a different calendar, or a
+        410 Gone (token expired) does a full listing instead.
+        """
+        state = self._load_calendar_state()
+        events = state.get('events', {})
+        changes = None
+        
+        if state.get('sync_token'):
+            try:
+                changes, sync_token = self._list_event_pages(syncToken=state['sync_token'])
+            except HttpError as e:
+                if e.resp.status != 410:
+                    raise
+                logging.warning("Calendar sync token expired (410 Gone) - doing a full resync")
+        
+        full_resync = changes is None
+        if full_resync:
+            events = {}
+            changes, sync_token = self._list_event_pages()
+        
+        for google_event in changes:
+            if google_event.get('status') == 'cancelled':
+                events.pop(google_event['id'], None)
+            else:
+                events[google_event['id']] = {field: google_event[field] for field in MIRRORED_FIELDS
+                                              if field in google_event}
+        
+        self._save_calendar_state({'calendar_id': self.calendar_id, 'sync_token': sync_token, 'events': events})
+        logging.info(f"Calendar change feed: {len(changes)} {'events listed (full resync)' if full_resync else 'changes'}, "
+                     f"{len(events)} events mirrored")
+        return events
+    
+    def list_calendar_events(self, from_date: str, to_date: str) -> List[Dict]:
+        """Google events starting from from_date up to and including to_date, by start date
+        
+        Read from the change-feed mirror, so this costs one small request when
+        little has changed.
+        """
+        events = [event for event in self.fetch_calendar_changes().values()
+                  if from_date <= event_start_date(event) <= to_date]
+        return sorted(events, key=event_start_date)
+    
     def cleanup_calendar(self, from_date: str = "2025-08-01", dry_run: bool = False):
         """Delete all Google Calendar events from specified date onwards"""
         if not self.calendar_id:
@@ -128,40 +358,28 @@ class GoogleCalendarSync:
         logging.info(f"{'DRY RUN: ' if dry_run else ''}Cleaning up calendar from {from_date}")
         
         try:
-            # Convert date to RFC3339 format
-            start_time = f"{from_date}T00:00:00Z"
-            end_time = "2028-12-31T23:59:59Z"
-            
             # Get all events in the date range
-            events_result = self.calendar_service.events().list(
-                calendarId=self.calendar_id,
-                timeMin=start_time,
-                timeMax=end_time,
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-            
-            events = events_result.get('items', [])
+            events = self.list_calendar_events(from_date, "2028-12-31")
             logging.info(f"Found {len(events)} events to delete")
             
-            deleted_count = 0
-            for event in events:
-                if dry_run:
+            if dry_run:
+                for event in events:
                     logging.info(f"Would delete: {event.get('summary', 'No title')} on {event.get('start', {}).get('date', event.get('start', {}).get('dateTime', 'Unknown'))}")
-                else:
-                    try:
-                        self.calendar_service.events().delete(
-                            calendarId=self.calendar_id,
-                            eventId=event['id']
-                        ).execute()
-                        deleted_count += 1
-                        logging.info(f"Deleted event {deleted_count}: {event.get('summary', 'No title')}")
-                        time.sleep(REQUEST_DELAY)  # Rate limiting
-                    except HttpError as e:
-                        logging.error(f"Error deleting event {event['id']}: {e}")
+                return
             
-            if not dry_run:
-                logging.info(f"Successfully deleted {deleted_count} events from calendar")
+            deleted = self.execute_in_batches(
+                events,
+                lambda event: self.service().events().delete(
+                    calendarId=self.calendar_id,
+                    eventId=event['id']
+                ),
+                lambda event: f"deleting event {event['id']} ({event.get('summary', 'No title')})"
+            )
+            for index in sorted(deleted):
+                logging.info(f"Deleted event: {events[index].get('summary', 'No title')}")
+            
+            logging.info(f"Successfully deleted {len(deleted)} events from calendar")
+            logging.info(f"Rate limiter: {self.rate_limiter.summary()}")
             
         except Exception as e:
             logging.error(f"Error during calendar cleanup: {e}")
@@ -294,8 +512,12 @@ class GoogleCalendarSync:
         return price > 0 or len(notes) > 0
     
     def fetch_events_from_supabase(self, from_date: str = "2025-08-01", 
-                                  to_date: str = "2028-01-31") -> List[Dict]:
-        """Fetch all events from Supabase in the specified date range"""
+                                  to_date: str = "2028-01-31") -> Optional[List[Dict]]:
+        """Fetch all events from Supabase in the specified date range
+        
+        Returns None if the fetch fails, so callers can tell a failure from a
+        range with no events.
+        """
         try:
             result = self.supabase.rpc('get_all_events_for_sync', {
                 'p_tenant_id': TENANT_ID,
@@ -318,7 +540,67 @@ class GoogleCalendarSync:
             
         except Exception as e:
             logging.error(f"Error fetching events from Supabase: {e}")
-            return []
+            return None
+    
+    def execute_in_batches(self, items: List[Any], make_request: Callable[[Any], Any],
+                           describe: Callable[[Any], str], idempotent: bool = True) -> Dict[int, Any]:
+        """Send one API request per item, BATCH_SIZE requests per batch HTTP request
+        
+        make_request(item) builds the (unexecuted) request. Returns {item index: response}
+        for the items that succeeded. Items that fail inside a batch with a rate-limit
+        or 5xx error are retried once on their own; other failures are logged using
+        describe(item). If the batch request itself fails, Google may still have
+        applied it, so its unanswered items are only re-sent when the requests are
+        idempotent (not for inserts, which would duplicate events) or when Google
+        rate-limited the whole batch.
+        """
+        responses = {}
+        
+        for batch_start in range(0, len(items), BATCH_SIZE):
+            indexes = range(batch_start, min(batch_start + BATCH_SIZE, len(items)))
+            failed = {}
+            retry = []
+            
+            def callback(request_id, response, exception):
+                if exception is None:
+                    responses[int(request_id)] = response
+                else:
+                    failed[int(request_id)] = exception
+            
+            batch = self.service().new_batch_http_request(callback=callback)
+            for index in indexes:
+                batch.add(make_request(items[index]), request_id=str(index))
+            
+            # Every request inside a batch counts against the quota
+            try:
+                self.rate_limiter.execute(batch, tokens=len(indexes))
+            except Exception as e:
+                logging.error(f"Batch request for items {batch_start + 1}-{indexes[-1] + 1} failed: {e}")
+                unanswered = [index for index in indexes if index not in responses and index not in failed]
+                if idempotent or is_rate_limit_error(e):
+                    retry.extend(unanswered)
+                else:
+                    for index in unanswered:
+                        logging.error(f"Error {describe(items[index])}: outcome unknown ({e}) - not resent, "
+                                      f"the next incremental sync reconciles it")
+            
+            for index, error in failed.items():
+                if is_retryable_error(error):
+                    retry.append(index)
+                else:
+                    logging.error(f"Error {describe(items[index])}: {error}")
+            
+            if retry:
+                logging.warning(f"{len(retry)} of {len(indexes)} batched requests failed - retrying individually")
+                if any(is_rate_limit_error(e) for e in failed.values()):
+                    self.rate_limiter.backoff(0)
+            for index in sorted(retry):
+                try:
+                    responses[index] = self.rate_limiter.execute(make_request(items[index]))
+                except Exception as e:
+                    logging.error(f"Error {describe(items[index])}: {e}")
+        
+        return responses
     
     def determine_event_type(self, event_forms: List[Dict]) -> str:
         """Determine event type based on available forms"""
@@ -336,65 +618,59 @@ class GoogleCalendarSync:
         else:
             return 'Unknown'
     
-    def create_google_calendar_event(self, event: Dict) -> Optional[str]:
-        """Create a Google Calendar event and return its ID"""
-        try:
-            event_forms = event.get('event_forms', [])
-            event_type = self.determine_event_type(event_forms)
-            
-            # Prepare event data
-            start_time = event.get('start_time')
-            end_time = event.get('end_time')
-            event_date = event.get('event_date')
-            
-            # Create datetime objects
-            if start_time and end_time:
-                start_datetime = f"{event_date}T{start_time}"
-                end_datetime = f"{event_date}T{end_time}"
-            else:
-                # All-day event
-                start_datetime = event_date
-                end_datetime = event.get('event_end_date', event_date)
-            
-            # Format description based on event type
-            description = ""
-            if event_type == 'Nikkah':
-                nikkah_form = next((form for form in event_forms if 'nikkah' in form.get('form_label', '').lower()), {})
-                description = self.format_nikkah_description(event, nikkah_form)
-            elif event_type == 'Reception':
-                reception_form = next((form for form in event_forms if 'reception' in form.get('form_label', '').lower()), {})
-                description = self.format_reception_description(event, reception_form)
-            elif event_type == 'All Day':
-                nikkah_form = next((form for form in event_forms if 'nikkah' in form.get('form_label', '').lower()), {})
-                reception_form = next((form for form in event_forms if 'reception' in form.get('form_label', '').lower()), {})
-                description = self.format_all_day_description(event, nikkah_form, reception_form)
-            
-            # Create Google Calendar event
-            calendar_event = {
-                'summary': event.get('title', 'Untitled Event'),
-                'description': description,
-            }
-            
-            # Set time/date
-            if start_time and end_time:
-                calendar_event['start'] = {'dateTime': start_datetime, 'timeZone': 'Europe/London'}
-                calendar_event['end'] = {'dateTime': end_datetime, 'timeZone': 'Europe/London'}
-            else:
-                calendar_event['start'] = {'date': start_datetime}
-                calendar_event['end'] = {'date': end_datetime}
-            
-            # Create the event
-            created_event = self.calendar_service.events().insert(
-                calendarId=self.calendar_id,
-                body=calendar_event
-            ).execute()
-            
-            logging.info(f"Created Google Calendar event: {event.get('title')} ({event_type})")
-            return created_event['id']
-            
-        except Exception as e:
-            logging.error(f"Error creating Google Calendar event for {event.get('title', 'Unknown')}: {e}")
-            return None
+    def build_calendar_event(self, event: Dict) -> Dict:
+        """Build the Google Calendar event body for a Supabase event"""
+        event_forms = event.get('event_forms', [])
+        event_type = self.determine_event_type(event_forms)
+        
+        # Prepare event data
+        start_time = event.get('start_time')
+        end_time = event.get('end_time')
+        event_date = event.get('event_date')
+        
+        # Create datetime objects
+        if start_time and end_time:
+            start_datetime = f"{event_date}T{start_time}"
+            end_datetime = f"{event_date}T{end_time}"
+        else:
+            # All-day event
+            start_datetime = event_date
+            end_datetime = event.get('event_end_date', event_date)
+        
+        # Format description based on event type
+        description = ""
+        if event_type == 'Nikkah':
+            nikkah_form = next((form for form in event_forms if 'nikkah' in form.get('form_label', '').lower()), {})
+            description = self.format_nikkah_description(event, nikkah_form)
+        elif event_type == 'Reception':
+            reception_form = next((form for form in event_forms if 'reception' in form.get('form_label', '').lower()), {})
+            description = self.format_reception_description(event, reception_form)
+        elif event_type == 'All Day':
+            nikkah_form = next((form for form in event_forms if 'nikkah' in form.get('form_label', '').lower()), {})
+            reception_form = next((form for form in event_forms if 'reception' in form.get('form_label', '').lower()), {})
+            description = self.format_all_day_description(event, nikkah_form, reception_form)
+        
+        # Create Google Calendar event
+        calendar_event = {
+            'summary': event.get('title', 'Untitled Event'),
+            'description': description,
+        }
+        
+        # Set time/date
+        if start_time and end_time:
+            calendar_event['start'] = {'dateTime': start_datetime, 'timeZone': 'Europe/London'}
+            calendar_event['end'] = {'dateTime': end_datetime, 'timeZone': 'Europe/London'}
+        else:
+            calendar_event['start'] = {'date': start_datetime}
+            calendar_event['end'] = {'date': end_datetime}
+        
+        calendar_event['extendedProperties'] = {'private': {
+            SYNC_PROPERTY_TENANT: TENANT_ID,
+            SYNC_PROPERTY_EVENT: str(event.get('id', '')),
+            SYNC_PROPERTY_HASH: content_hash(calendar_event),
+        }}
+        
+        return calendar_event
     
     def update_supabase_external_id(self, event_id: str, external_calendar_id: str) -> bool:
         """Update the external_calendar_id in Supabase"""
@@ -414,13 +690,82 @@ class GoogleCalendarSync:
             logging.error(f"Error updating external_calendar_id for event {event_id}: {e}")
             return False
     
-    def sync_all_events(self, dry_run: bool = False):
-        """Main sync function - sync all events to Google Calendar"""
+    def sync_chunk(self, chunk: List[tuple]) -> List[tuple]:
+        """Create the Google events of one chunk of (event, calendar body) pairs and
+        record their external IDs in Supabase
+        
+        Each event's Supabase update runs only after its Google event exists.
+        Returns (synced, latency seconds) per event, latency counted from the
+        start of the chunk to that event's Supabase update.
+        """
+        started = time.perf_counter()
+        created = self.execute_in_batches(
+            chunk,
+            lambda item: self.service().events().insert(
+                calendarId=self.calendar_id,
+                body=item[1]
+            ),
+            lambda item: f"creating Google Calendar event for {item[0].get('title', 'Unknown')}",
+            idempotent=False
+        )
+        
+        results = []
+        for index, (event, _) in enumerate(chunk):
+            if index not in created:
+                results.append((False, time.perf_counter() - started))
+                continue
+            
+            event_type = self.determine_event_type(event.get('event_forms', []))
+            logging.info(f"Created Google Calendar event: {event.get('title')} ({event_type})")
+            
+            # Update Supabase with external ID
+            synced = self.update_supabase_external_id(event['id'], created[index]['id'])
+            results.append((synced, time.perf_counter() - started))
+        return results
+    
+    def create_events(self, to_create: List[tuple], workers: int = SYNC_WORKERS) -> List[bool]:
+        """Create Google events for (event, calendar body) pairs and store their external IDs
+        
+        Events go a chunk at a time, recording each chunk's external IDs in
+        Supabase before moving on; with workers > 1 the chunks run on that many
+        threads. Smaller chunks keep every worker busy when there are few events.
+        Returns whether each event was synced.
+        """
+        workers = max(1, workers)
+        chunk_size = max(1, min(BATCH_SIZE, math.ceil(len(to_create) / workers)))
+        chunks = [to_create[start:start + chunk_size] for start in range(0, len(to_create), chunk_size)]
+        started = time.perf_counter()
+        
+        if workers > 1 and len(chunks) > 1:
+            logging.info(f"Syncing {len(to_create)} events in {len(chunks)} chunks on {workers} workers")
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='calendar-sync') as executor:
+                chunk_results = list(executor.map(self.sync_chunk, chunks))
+        else:
+            chunk_results = [self.sync_chunk(chunk) for chunk in chunks]
+        
+        elapsed = time.perf_counter() - started
+        results = [result for results in chunk_results for result in results]
+        if results:
+            latencies = [latency for _, latency in results]
+            logging.info(f"Throughput: {len(latencies) / elapsed:.1f} events/second over {elapsed:.1f}s "
+                         f"({workers} worker{'s' if workers > 1 else ''}), per-event latency "
+                         f"p50 {percentile(latencies, 50):.2f}s, p95 {percentile(latencies, 95):.2f}s")
+        return [synced for synced, _ in results]
+    
+    def sync_all_events(self, dry_run: bool = False, workers: int = SYNC_WORKERS):
+        """Main sync function - sync all events to Google Calendar
+        
+        Events are created in chunks of up to BATCH_SIZE; with workers > 1 the
+        chunks run on that many threads under the shared rate limiter.
+        """
         logging.info(f"{'DRY RUN: ' if dry_run else ''}Starting complete event sync")
         
         # Fetch events
         events = self.fetch_events_from_supabase()
         
+        if events is None:
+            logging.error("Could not fetch events from Supabase - aborting sync")
+            return
         if not events:
             logging.error("No events found to sync")
             return
@@ -428,6 +773,8 @@ class GoogleCalendarSync:
         successful_syncs = 0
         failed_syncs = 0
         
+        to_create = []  # (event, calendar event body)
+        
         for i, event in enumerate(events, 1):
             logging.info(f"Processing event {i}/{len(events)}: {event.get('title', 'Untitled')}")
             
@@ -436,25 +783,122 @@ class GoogleCalendarSync:
                 logging.info(f"Would sync: {event.get('title')} ({event_type}) on {event.get('event_date')}")
                 successful_syncs += 1
             else:
-                # Create Google Calendar event
-                external_id = self.create_google_calendar_event(event)
-                
-                if external_id:
-                    # Update Supabase with external ID
-                    if self.update_supabase_external_id(event['id'], external_id):
-                        successful_syncs += 1
-                    else:
-                        failed_syncs += 1
-                else:
+                try:
+                    to_create.append((event, self.build_calendar_event(event)))
+                except Exception as e:
+                    logging.error(f"Error creating Google Calendar event for {event.get('title', 'Unknown')}: {e}")
                     failed_syncs += 1
-                
-                # Rate limiting
-                time.sleep(REQUEST_DELAY)
+        
+        for synced in self.create_events(to_create, workers):
+            if synced:
+                successful_syncs += 1
+            else:
+                failed_syncs += 1
         
         logging.info(f"Sync completed. Successful: {successful_syncs}, Failed: {failed_syncs}")
+        if not dry_run:
+            logging.info(f"Rate limiter: {self.rate_limiter.summary()}")
         
         if not dry_run and successful_syncs != len(events):
             logging.warning(f"Expected {len(events)} events but only {successful_syncs} were successfully synced")
+    
+    def sync_changed_events(self, dry_run: bool = False, workers: int = SYNC_WORKERS,
+                            from_date: str = "2025-08-01", to_date: str = "2028-01-31"):
+        """Incremental sync - only write Google events whose content changed
+        
+        Supabase events are matched to Google events through external_calendar_id
+        and compared by the content hash stored in the Google event's private
+        extended properties. Changed events are patched, events without a Google
+        event are created, and Google events this script created for this tenant
+        that no Supabase event references any more are deleted. A re-run with no
+        data changes makes no write calls. Nothing is written if the Supabase
+        fetch fails, or if it returns no events while such Google events exist.
+        """
+        logging.info(f"{'DRY RUN: ' if dry_run else ''}Starting incremental event sync")
+        
+        events = self.fetch_events_from_supabase(from_date, to_date)
+        if events is None:
+            # Every tenant-tagged Google event would look unreferenced and be deleted
+            logging.error("Could not fetch events from Supabase - aborting incremental sync")
+            return
+        try:
+            google_events = {event['id']: event for event in self.list_calendar_events(from_date, to_date)}
+        except Exception as e:
+            logging.error(f"Error listing Google Calendar events: {e}")
+            return
+        
+        to_create = []  # (event, calendar event body)
+        to_patch = []  # (Google event ID, calendar event body)
+        referenced = set()
+        unchanged = 0
+        failed_syncs = 0
+        
+        for event in events:
+            try:
+                calendar_event = self.build_calendar_event(event)
+            except Exception as e:
+                logging.error(f"Error creating Google Calendar event for {event.get('title', 'Unknown')}: {e}")
+                failed_syncs += 1
+                continue
+            
+            existing = google_events.get(event.get('external_calendar_id'))
+            if existing is None:
+                to_create.append((event, calendar_event))
+                continue
+            
+            referenced.add(existing['id'])
+            stored_hash = private_properties(existing).get(SYNC_PROPERTY_HASH)
+            if stored_hash == calendar_event['extendedProperties']['private'][SYNC_PROPERTY_HASH]:
+                unchanged += 1
+            else:
+                to_patch.append((existing['id'], calendar_event))
+        
+        to_delete = [
+            google_event for google_event_id, google_event in google_events.items()
+            if google_event_id not in referenced
+            and private_properties(google_event).get(SYNC_PROPERTY_TENANT) == TENANT_ID
+        ]
+        if not events and to_delete:
+            logging.error(f"Supabase returned no events but {len(to_delete)} Google events were created for this "
+                          f"tenant - refusing to delete them all (use the calendar clean-up if that is intended)")
+            return
+        
+        logging.info(f"{unchanged} unchanged, {len(to_create)} to create, {len(to_patch)} to update, "
+                     f"{len(to_delete)} to delete")
+        if dry_run:
+            return
+        
+        # start/end switch between 'date' and 'dateTime'; nulls clear the other form
+        def patch_body(calendar_event):
+            return {
+                **calendar_event,
+                'start': {'date': None, 'dateTime': None, 'timeZone': None, **calendar_event['start']},
+                'end': {'date': None, 'dateTime': None, 'timeZone': None, **calendar_event['end']},
+            }
+        
+        patched = self.execute_in_batches(
+            to_patch,
+            lambda item: self.service().events().patch(
+                calendarId=self.calendar_id,
+                eventId=item[0],
+                body=patch_body(item[1])
+            ),
+            lambda item: f"updating Google Calendar event {item[0]} ({item[1]['summary']})"
+        )
+        deleted = self.execute_in_batches(
+            to_delete,
+            lambda google_event: self.service().events().delete(
+                calendarId=self.calendar_id,
+                eventId=google_event['id']
+            ),
+            lambda google_event: f"deleting event {google_event['id']} ({google_event.get('summary', 'No title')})"
+        )
+        created = self.create_events(to_create, workers)
+        
+        failed_syncs += len(to_patch) - len(patched) + len(to_delete) - len(deleted) + created.count(False)
+        logging.info(f"Incremental sync completed. Unchanged: {unchanged}, Created: {created.count(True)}, "
+                     f"Updated: {len(patched)}, Deleted: {len(deleted)}, Failed: {failed_syncs}")
+        logging.info(f"Rate limiter: {self.rate_limiter.summary()}")
 
 def main():
     """Main function"""
@@ -483,9 +927,10 @@ def main():
             print("1. Clean up calendar (delete events from date)")
             print("2. Dry run sync (preview what would be synced)")
             print("3. Full sync (create events and update Supabase)")
-            print("4. Exit")
+            print("4. Incremental sync (only create/update/delete changed events)")
+            print("5. Exit")
             
-            choice = input("\nEnter your choice (1-4): ").strip()
+            choice = input("\nEnter your choice (1-5): ").strip()
             
             if choice == '1':
                 from_date = input("Delete events from date (YYYY-MM-DD, default: 2025-08-01): ").strip()
@@ -505,12 +950,18 @@ def main():
             elif choice == '3':
                 confirm = input("This will create Google Calendar events and update Supabase. Continue? (yes/no): ").strip().lower()
                 if confirm == 'yes':
+                    workers = input(f"Parallel workers (default: {SYNC_WORKERS}): ").strip()
                     print("Starting full sync...")
-                    sync.sync_all_events(dry_run=False)
+                    sync.sync_all_events(dry_run=False, workers=int(workers) if workers.isdigit() else SYNC_WORKERS)
                 else:
                     print("Operation cancelled")
                     
             elif choice == '4':
+                workers = input(f"Parallel workers (default: {SYNC_WORKERS}): ").strip()
+                print("Starting incremental sync...")
+                sync.sync_changed_events(dry_run=False, workers=int(workers) if workers.isdigit() else SYNC_WORKERS)
+                
+            elif choice == '5':
                 print("Goodbye!")
                 break
                 
@@ -0,0 +1,71 @@
+"""
+Bounded LRU memo for PowerApps datetime parsing
+Shared by the All Days import scripts - exports repeat the same slot timestamps
+over and over, so each distinct raw value only goes through normalize/strptime once.
+"""
+
+import inspect
+from collections import OrderedDict
+
+DEFAULT_MAXSIZE = 4096
+
+class DatetimeParseCache:
+    """LRU memo in front of a parse_powerapp_datetime implementation.
+
+    Results are keyed on the raw cell value. field_name is only forwarded to the
+    parser on a miss (for its logging), so the same timestamp appearing in
+    several columns is parsed once. Works with both parser signatures used by
+    the import scripts: parse(date_str) and parse(date_str, field_name).
+    """
+
+    def __init__(self, parse, maxsize=DEFAULT_MAXSIZE):
+        self.parse = parse
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._cache = OrderedDict()
+        self._takes_field_name = len(inspect.signature(parse).parameters) > 1
+
+    def _parse(self, date_str, field_name):
+        if self._takes_field_name:
+            return self.parse(date_str, field_name)
+        return self.parse(date_str)
+
+    def __call__(self, date_str, field_name="unknown"):
+        # Blank cells are cheap to reject and NaN never compares equal to itself
+        if date_str is None or (isinstance(date_str, float) and date_str != date_str):
+            return self._parse(date_str, field_name)
+
+        key = (type(date_str), date_str)
+        try:
+            result = self._cache[key]
+        except KeyError:
+            self.misses += 1
+            result = self._parse(date_str, field_name)
+            self._cache[key] = result
+            if len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+            return result
+        except TypeError:  # unhashable value - parse without caching
+            return self._parse(date_str, field_name)
+
+        self.hits += 1
+        self._cache.move_to_end(key)
+        return result
+
+    def clear(self):
+        self._cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def merge_counts(self, hits, misses):
+        """Fold in hit/miss counts from another process's cache (import workers)."""
+        self.hits += hits
+        self.misses += misses
+
+    def summary(self):
+        """One-line hit/miss description for the import summary."""
+        lookups = self.hits + self.misses
+        hit_rate = self.hits / lookups if lookups else 0.0
+        return (f"{self.hits} hits, {self.misses} misses ({hit_rate:.1%} hit rate), "
+                f"{len(self._cache)}/{self.maxsize} cached")
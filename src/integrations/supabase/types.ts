@@ -2988,6 +2988,7 @@ export type Database = {
           event_date: string
           event_end_date: string
           event_forms: Json[]
+          external_calendar_id: string
           id: string
           primary_contact_name: string
           primary_contact_number: string
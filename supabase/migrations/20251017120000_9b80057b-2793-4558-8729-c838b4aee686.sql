@@ -0,0 +1,53 @@
+-- Normalized phone matching for customer lookups
+-- Mirrors normalize_phone_number() in All_Days_Import_Script_Perfect.py: both must
+-- produce the same E.164-style key ('+447700900123') for the same input.
+
+CREATE OR REPLACE FUNCTION public.normalize_phone_e164(raw_phone TEXT)
+RETURNS TEXT
+LANGUAGE plpgsql
+IMMUTABLE
+PARALLEL SAFE
+SET search_path TO 'public'
+AS $function$
+DECLARE
+  cleaned TEXT;
+  digits TEXT;
+BEGIN
+  IF raw_phone IS NULL THEN
+    RETURN NULL;
+  END IF;
+
+  -- Trim, then drop a '.0' suffix left by numbers that passed through a float
+  cleaned := regexp_replace(regexp_replace(raw_phone, '^\s+|\s+$', '', 'g'), '\.0+$', '');
+  digits := regexp_replace(cleaned, '\D', '', 'g');
+
+  IF left(cleaned, 1) = '+' THEN
+    NULL;
+  ELSIF left(digits, 2) = '00' THEN
+    digits := substr(digits, 3);
+  ELSIF left(digits, 1) = '0' THEN
+    digits := '44' || substr(digits, 2);
+  ELSIF left(digits, 2) = '44' AND length(digits) = 12 THEN
+    NULL;
+  ELSIF length(digits) = 10 THEN
+    digits := '44' || digits;
+  END IF;
+
+  -- '+44 (0)7700 ...' style trunk zero
+  IF left(digits, 3) = '440' THEN
+    digits := '44' || substr(digits, 4);
+  END IF;
+
+  IF length(digits) < 7 THEN
+    RETURN NULL;
+  END IF;
+
+  RETURN '+' || digits;
+END;
+$function$;
+
+-- Expression indexes for tenant-scoped phone/mobile lookups
+CREATE INDEX IF NOT EXISTS idx_customers_tenant_phone_e164
+  ON public.customers (tenant_id, public.normalize_phone_e164(phone));
+CREATE INDEX IF NOT EXISTS idx_customers_tenant_mobile_e164
+  ON public.customers (tenant_id, public.normalize_phone_e164(mobile));